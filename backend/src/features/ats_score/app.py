@@ -1,19 +1,20 @@
 import os
+import asyncio
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from google import genai
 from PyPDF2 import PdfReader
 from werkzeug.utils import secure_filename
 from typing import Optional
 from google.genai import types
 import pathlib
-from pydantic import BaseModel,ConfigDict # Import BaseModel
+from pydantic import BaseModel # Import BaseModel
+
+from common import llm_gateway
+from common.skills import get_taxonomy, normalize_skill
 
 # Load API key from .env
 load_dotenv()
-client = genai.Client(api_key=os.getenv("Test_API_KEY"))
 model  = os.getenv("GEMINI_MODEL")
 # FastAPI app setup
 app = FastAPI(title="Resume ATS Score Analyzer")
@@ -37,12 +38,29 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)  # Ensure upload folder exists
 def allowed_file(filename: str) -> bool:
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
-# Function to extract text from PDF (not directly used with Gemini's PDF handling, but kept for completeness)
+# Function to extract text from PDF (Gemini reads the PDF itself; this text is used to check its missing keywords)
 def read_pdf(file_path: str) -> str:
     pdf_reader = PdfReader(file_path)
     pdf_text = "".join([page.extract_text() or "" for page in pdf_reader.pages])
     return pdf_text.strip()
 
+def filter_missing_keywords(keywords: list[str], resume_text: str) -> list[str]:
+    """Drop keywords the resume already mentions (by canonical skill) and repeats of the same skill."""
+    taxonomy = get_taxonomy()
+    present = taxonomy.find_in_text(resume_text)
+    # Keywords the taxonomy doesn't know are matched as whole phrases
+    normalized_text = f" {normalize_skill(resume_text)} "
+    kept, seen = [], set()
+    for keyword in keywords:
+        skill_id = taxonomy.canonical(keyword)
+        if skill_id in present or skill_id in seen:
+            continue
+        if not taxonomy.is_known(skill_id) and f" {skill_id} " in normalized_text:
+            continue
+        seen.add(skill_id)
+        kept.append(keyword)
+    return kept
+
 # Function to get AI response from Gemini
 
 
@@ -88,7 +106,7 @@ class ATSOptimizationOutput(BaseModel):
     ats_compatibility_score: int
 
 
-def get_gemini_output(file_path: str, prompt: str,analysis_option: str) :
+async def get_gemini_output(file_path: str, prompt: str,analysis_option: str) :
     filepath = pathlib.Path(file_path)
     if analysis_option =="Quick Scan":
         configi=types.GenerateContentConfig(
@@ -105,7 +123,7 @@ def get_gemini_output(file_path: str, prompt: str,analysis_option: str) :
           response_mime_type='application/json',
           response_schema= ATSOptimizationOutput
       )
-    response = client.models.generate_content(
+    response = await llm_gateway.generate_content(
         model=model,
         contents=[
         types.Part.from_bytes(
@@ -187,7 +205,15 @@ async def analyze_resume(
         """
     
     # Get AI response
-    response_text = get_gemini_output(file_path, prompt,analysis_option)
+    response_text = await get_gemini_output(file_path, prompt,analysis_option)
+
+    if isinstance(response_text, ATSOptimizationOutput):
+        # The model often lists a keyword the resume already has under another name ("JS" / "JavaScript")
+        try:
+            resume_text = await asyncio.to_thread(read_pdf, file_path)
+            response_text.missing_keywords = filter_missing_keywords(response_text.missing_keywords, resume_text)
+        except Exception as e:
+            print(f"[ATS] keyword filtering skipped: {e}")
     
     # Clean up file after processing
     os.unlink(file_path)
@@ -201,6 +227,4 @@ async def root():
 
 if __name__ == "__main__":
     import uvicorn
-    import json # Import json
-    from pydantic import ValidationError # Import ValidationError
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
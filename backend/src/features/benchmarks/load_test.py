@@ -0,0 +1,300 @@
+"""
+Concurrent load test for the /api/* endpoints.
+
+Run against a server started with the offline LLM/TTS stand-ins, so the
+numbers measure this code rather than Gemini or Murf:
+
+    LLM_BACKEND=fake TTS_BACKEND=fake FAKE_LLM_LATENCY_MS=800 uvicorn main:app
+    python -m benchmarks.load_test --concurrency 16 --requests 200
+
+or in-process without a server (same env vars, --in-process). Each scenario
+reports throughput and p50/p95/p99 latency; --json saves the report so runs
+can be compared before and after a change.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from typing import Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+SUBJECTS = ["DBMS", "OOP", "Computer Networks", "OS"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+ATS_OPTIONS = ["Quick Scan", "Detailed Analysis", "ATS Optimization"]
+
+RESUME_TEXT = [
+    "Jane Doe - Software Engineer",
+    "B.Tech Computer Engineering, CGPA 8.4",
+    "Skills: Python, SQL, React, Docker, Data Structures",
+    "Project: Placement portal with FastAPI and PostgreSQL",
+    "Experience: Backend intern, built REST APIs and CI pipelines",
+]
+
+CAPTIONS = "WEBVTT\n\n" + "\n".join(
+    f"00:00:{i * 5:02d}.000 --> 00:00:{i * 5 + 5:02d}.000\n{line}\n"
+    for i, line in enumerate([
+        "Today we look at how an operating system schedules processes.",
+        "Round robin gives each process a fixed time slice in turn.",
+        "Shortest job first minimises the average waiting time.",
+        "Priority scheduling can starve low priority processes.",
+        "Aging raises the priority of processes that wait too long.",
+        "Multilevel queues combine several of these policies.",
+    ]))
+
+
+def sample_pdf(lines: List[str]) -> bytes:
+    """A minimal one-page text PDF, so resume endpoints get something extractable."""
+    stream = "BT /F1 12 Tf 72 720 Td 16 TL " + " ".join(
+        f"({line.replace('(', '').replace(')', '')}) '" for line in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        "/Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out, offsets = "%PDF-1.4\n", []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+def silent_wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    frames = int(seconds * rate) * 2
+    header = (b"RIFF" + (36 + frames).to_bytes(4, "little") + b"WAVEfmt "
+              + (16).to_bytes(4, "little") + (1).to_bytes(2, "little") + (1).to_bytes(2, "little")
+              + rate.to_bytes(4, "little") + (rate * 2).to_bytes(4, "little")
+              + (2).to_bytes(2, "little") + (16).to_bytes(2, "little")
+              + b"data" + frames.to_bytes(4, "little"))
+    return header + b"\x00" * frames
+
+
+def percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    # Nearest-rank percentile
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+class Scenario:
+    """
+    One endpoint under load. `setup` runs once before timing and its result is
+    passed to `call`; `worker_setup` runs once per concurrent worker, for state
+    that must not be shared between them (e.g. a conversation).
+    """
+
+    def __init__(self, name: str, call: Callable[[httpx.AsyncClient, int, dict], Awaitable[httpx.Response]],
+                 setup: Optional[Callable[[httpx.AsyncClient], Awaitable[dict]]] = None,
+                 worker_setup: Optional[Callable[[httpx.AsyncClient], Awaitable[dict]]] = None):
+        self.name = name
+        self.call = call
+        self.setup = setup
+        self.worker_setup = worker_setup
+
+
+# ========= Scenarios =========
+async def mcq_generate(client, i, state):
+    return await client.post("/api/mcq/generate_mcq", json={
+        "subject": SUBJECTS[i % len(SUBJECTS)], "difficulty": DIFFICULTIES[i % len(DIFFICULTIES)]})
+
+
+async def mcq_stream(client, i, state):
+    async with client.stream("POST", "/api/mcq/generate_mcq/stream", json={
+            "subject": SUBJECTS[i % len(SUBJECTS)], "difficulty": DIFFICULTIES[i % len(DIFFICULTIES)]}) as response:
+        async for _ in response.aiter_lines():
+            pass
+    return response
+
+
+async def resume_analyze(client, i, state):
+    return await client.post("/api/resume/analyze", files={
+        "resume": (f"bench-{uuid.uuid4().hex}.pdf", state["pdf"], "application/pdf")})
+
+
+async def resume_companies(client, i, state):
+    return await client.get("/api/resume/companies")
+
+
+async def resume_eligible_companies(client, i, state):
+    return await client.post("/api/resume/eligible_companies", json={
+        "cgpa": 6 + (i % 40) / 10, "hsc": 60 + i % 40, "ssc": 60 + i % 40,
+        "branch": ["CE", "IT", "ENTC"][i % 3], "skills": ["Python", "SQL", "Problem Solving"]})
+
+
+async def ats_score(client, i, state):
+    return await client.post("/api/ats/score",
+                             files={"resume": (f"bench-{uuid.uuid4().hex}.pdf", state["pdf"], "application/pdf")},
+                             data={"analysis_option": ATS_OPTIONS[i % len(ATS_OPTIONS)],
+                                   "job_description": "Backend engineer, Python and SQL"})
+
+
+async def interview_start(client, i, state):
+    return await client.post("/api/interview/start_interview/", json={
+        "name": f"Candidate {i}", "education": "B.Tech Computer Engineering", "skills": "Python, SQL",
+        "position": "Backend Engineer", "experience": "1 year internship", "projects": "Placement portal"})
+
+
+async def interview_answer_setup(client):
+    # One interview per worker: concurrent answers to one session would race on its chat history
+    response = await interview_start(client, 0, {})
+    response.raise_for_status()
+    return {"session_id": response.json()["session_id"]}
+
+
+async def interview_answer(client, i, state):
+    return await client.post("/api/interview/answer_question/", params={"session_id": state["session_id"]},
+                             files={"audio_file": ("answer.wav", silent_wav(), "audio/wav")})
+
+
+async def youtube_setup(client):
+    # Ingest a small caption file once and wait for its summary, then query it
+    response = await client.post("/api/youtube/summary/upload",
+                                 files={"files": (f"bench-{uuid.uuid4().hex}.vtt", CAPTIONS, "text/vtt")})
+    response.raise_for_status()
+    job = response.json()["jobs"][0]
+    session_id = job["session_id"]
+    while job.get("job_id") and job["status"] not in ("done", "failed"):
+        await asyncio.sleep(0.5)
+        job = (await client.get(f"/api/youtube/status/{job['job_id']}")).json()
+    if job["status"] == "failed":
+        raise RuntimeError(f"Caption ingest failed: {job.get('error')}")
+    return {"session_id": session_id}
+
+
+async def youtube_ask(client, i, state):
+    questions = ["What is round robin?", "How does aging work?", "Which policy minimises waiting time?"]
+    return await client.post("/api/youtube/ask", json={
+        "session_id": state["session_id"], "question": questions[i % len(questions)]})
+
+
+async def youtube_search(client, i, state):
+    return await client.post("/api/youtube/search", json={"query": "process scheduling starvation"})
+
+
+SCENARIOS: Dict[str, Scenario] = {scenario.name: scenario for scenario in [
+    Scenario("mcq_generate", mcq_generate),
+    Scenario("mcq_stream", mcq_stream),
+    Scenario("resume_analyze", resume_analyze),
+    Scenario("resume_companies", resume_companies),
+    Scenario("resume_eligible_companies", resume_eligible_companies),
+    Scenario("ats_score", ats_score),
+    Scenario("interview_start", interview_start),
+    Scenario("interview_answer", interview_answer, worker_setup=interview_answer_setup),
+    Scenario("youtube_ask", youtube_ask, youtube_setup),
+    Scenario("youtube_search", youtube_search, youtube_setup),
+]}
+
+
+# ========= Runner =========
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, concurrency: int) -> dict:
+    state = {"pdf": sample_pdf(RESUME_TEXT)}
+    if scenario.setup is not None:
+        state.update(await scenario.setup(client))
+    worker_states = [dict(state) for _ in range(concurrency)]
+    if scenario.worker_setup is not None:
+        for worker_state, extra in zip(worker_states, await asyncio.gather(
+                *(scenario.worker_setup(client) for _ in worker_states))):
+            worker_state.update(extra)
+
+    latencies, statuses, errors = [], {}, 0
+    counter = iter(range(requests))
+
+    async def worker(state):
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            try:
+                response = await scenario.call(client, i, state)
+                status = response.status_code
+            except httpx.HTTPError:
+                status = "exception"
+            elapsed = time.perf_counter() - started
+            statuses[status] = statuses.get(status, 0) + 1
+            if isinstance(status, int) and status < 400:
+                latencies.append(elapsed)
+            else:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(worker_state) for worker_state in worker_states))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda value: round(value * 1000, 1) if value is not None else None
+    return {
+        "scenario": scenario.name,
+        "requests": requests,
+        "concurrency": concurrency,
+        "errors": errors,
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "p50_ms": ms(percentile(latencies, 50)),
+        "p95_ms": ms(percentile(latencies, 95)),
+        "p99_ms": ms(percentile(latencies, 99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+    }
+
+
+def print_report(results: List[dict]) -> None:
+    columns = ["scenario", "requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms", "max_ms"]
+    widths = [max(len(column), *(len(str(result[column])) for result in results)) for column in columns]
+    print("  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for result in results:
+        print("  ".join(str(result[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+async def main(args) -> List[dict]:
+    if args.in_process:
+        # Imported here so the env (LLM_BACKEND=fake, ...) applies to the app
+        from main import app
+        transport = httpx.ASGITransport(app=app)
+    else:
+        transport = None
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, transport=transport, timeout=args.timeout,
+                                 limits=limits) as client:
+        results = []
+        for name in args.scenarios.split(","):
+            try:
+                result = await run_scenario(client, SCENARIOS[name], args.requests, args.concurrency)
+            except Exception as e:
+                result = {"scenario": name, "requests": 0, "errors": f"setup failed: {e}", "throughput_rps": None,
+                          "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+            print(f"[Benchmark] {name}: {result['throughput_rps']} req/s, p95 {result['p95_ms']} ms")
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the PrepGenius API endpoints")
+    parser.add_argument("--base-url", default=os.getenv("BENCHMARK_BASE_URL", "http://localhost:8000"))
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--in-process", action="store_true", help="Drive main:app directly instead of a server")
+    parser.add_argument("--json", help="Write the report to this file")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios.split(",") if name not in SCENARIOS]
+    if unknown:
+        sys.exit(f"Unknown scenarios: {', '.join(unknown)}")
+
+    results = asyncio.run(main(args))
+    print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
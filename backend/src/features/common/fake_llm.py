@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import typing
+from typing import Any, Optional
+
+from pydantic import BaseModel
+
+# Injected behaviour, so benchmarks can model a slow or flaky provider
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", 0))
+FAKE_LLM_JITTER_MS = float(os.getenv("FAKE_LLM_JITTER_MS", 0))
+FAKE_LLM_FAILURE_RATE = float(os.getenv("FAKE_LLM_FAILURE_RATE", 0))
+FAKE_LLM_STREAM_CHUNK_CHARS = int(os.getenv("FAKE_LLM_STREAM_CHUNK_CHARS", 200))
+
+_failures = random.Random(int(os.getenv("FAKE_LLM_SEED", 0)))
+
+
+class FakeLLMError(Exception):
+    """Injected provider failure (FAKE_LLM_FAILURE_RATE)."""
+
+
+class FakeUsage:
+    def __init__(self, prompt_tokens: int, output_tokens: int):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class FakeResponse:
+    """The parts of a google-genai response the feature apps read: text, parsed, usage_metadata."""
+
+    def __init__(self, text: str, parsed: Any, prompt: str):
+        self.text = text
+        self.parsed = parsed
+        self.usage_metadata = FakeUsage(_count_tokens(prompt), _count_tokens(text))
+
+
+def _count_tokens(text: str) -> int:
+    return int(len((text or "").split()) * 1.3)
+
+
+def _prompt_text(contents) -> str:
+    """Text parts of `contents` (strings and Parts with text); files and audio are ignored."""
+    if isinstance(contents, str):
+        return contents
+    if isinstance(contents, (list, tuple)):
+        return "\n".join(_prompt_text(part) for part in contents)
+    return getattr(contents, "text", None) or ""
+
+
+def _config_value(config, key: str):
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return config.get(key)
+    return getattr(config, key, None)
+
+
+def _rng(prompt: str) -> random.Random:
+    # Same prompt, same output
+    return random.Random(int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16], 16))
+
+
+def _fake_value(annotation, name: str, rng: random.Random, index: int = 0):
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Literal:
+        return args[index % len(args)]
+    if origin is typing.Union:
+        return _fake_value(next(arg for arg in args if arg is not type(None)), name, rng, index)
+    if origin in (list, typing.List):
+        return [_fake_value(args[0] if args else str, name, rng, i) for i in range(3)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_instance(annotation, rng)
+    if annotation is bool:
+        return False
+    if annotation is int:
+        return rng.randint(40, 95) if "score" in name.lower() else rng.randint(1, 10)
+    if annotation is float:
+        return round(rng.uniform(1, 10), 2)
+    words = ["scalable", "reliable", "concise", "measurable", "structured", "relevant", "technical", "clear"]
+    return f"{name.replace('_', ' ')} {index + 1}: {rng.choice(words)} {rng.choice(words)}"
+
+
+def fake_instance(schema: type, rng: random.Random) -> BaseModel:
+    """A deterministic, schema-valid instance of any pydantic model."""
+    return schema(**{name: _fake_value(field.annotation, name, rng)
+                     for name, field in schema.model_fields.items()})
+
+
+def _prompt_input(name: str, prompt: str, default: str) -> str:
+    match = re.search(re.escape(name) + r"\(`([^`]*)`\)", prompt)
+    return match.group(1).strip() if match and match.group(1).strip() else default
+
+
+def _fake_mcq_response(schema: type, prompt: str, rng: random.Random) -> BaseModel:
+    # MCQ prompts ask for an exact count and must not repeat excluded questions
+    match = re.search(r"exactly (\d+) questions", prompt)
+    count = int(match.group(1)) if match else 15
+    # The prompt states its inputs as Subject(`OS`), Difficulty Level(`Easy`) and Topic(`NA`)
+    subject, difficulty, topic = (_prompt_input(name, prompt, default) for name, default in
+                                  (("Subject", "General"), ("Difficulty Level", "Medium"), ("Topic", "NA")))
+    salt = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+    questions = []
+    for i in range(count):
+        answer = "ABCD"[i % 4]
+        questions.append({
+            "id": i + 1,
+            "subject": subject,
+            "topic": topic,
+            "difficulty": difficulty,
+            "question_text": f"Benchmark question {salt}-{i + 1}: which option describes concept {rng.randint(1, 10 ** 6)}?",
+            "options": [{"key": key, "text": f"Option {key} for {salt}-{i + 1}"} for key in "ABCD"],
+            "correct_answer": answer,
+            "explanation": f"Option {answer} is correct by construction.",
+        })
+    return schema(questions=questions)
+
+
+# Schemas whose outputs need more than field-by-field generation, by class name
+SCHEMA_FACTORIES = {"MCQResponse": _fake_mcq_response}
+
+
+def fake_response(contents, config=None) -> FakeResponse:
+    prompt = _prompt_text(contents)
+    rng = _rng(prompt)
+    schema = _config_value(config, "response_schema")
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        factory = SCHEMA_FACTORIES.get(schema.__name__)
+        parsed = factory(schema, prompt, rng) if factory else fake_instance(schema, rng)
+        return FakeResponse(parsed.model_dump_json(), parsed, prompt)
+
+    lines = [line.strip() for line in prompt.splitlines() if len(line.split()) > 3]
+    bullets = [f"- {' '.join(line.split()[:12])}" for line in rng.sample(lines, min(5, len(lines)))]
+    return FakeResponse("\n".join(bullets) or "- Summary unavailable.", None, prompt)
+
+
+async def _simulate_call() -> None:
+    delay = FAKE_LLM_LATENCY_MS + (random.uniform(-1, 1) * FAKE_LLM_JITTER_MS if FAKE_LLM_JITTER_MS else 0)
+    if delay > 0:
+        await asyncio.sleep(delay / 1000)
+    if FAKE_LLM_FAILURE_RATE and _failures.random() < FAKE_LLM_FAILURE_RATE:
+        raise FakeLLMError("Injected fake LLM failure")
+
+
+class _FakeModels:
+    async def generate_content(self, model: Optional[str] = None, contents=None, config=None):
+        await _simulate_call()
+        return fake_response(contents, config)
+
+    async def generate_content_stream(self, model: Optional[str] = None, contents=None, config=None):
+        await _simulate_call()
+        response = fake_response(contents, config)
+
+        async def chunks():
+            text = response.text
+            for start in range(0, len(text), FAKE_LLM_STREAM_CHUNK_CHARS):
+                yield FakeResponse(text[start:start + FAKE_LLM_STREAM_CHUNK_CHARS], None, "")
+        return chunks()
+
+
+class _FakeChat:
+    def __init__(self, model: Optional[str], config):
+        self._model = model
+        self._config = config
+        self._history = []
+
+    async def send_message(self, message):
+        await _simulate_call()
+        self._history.append(_prompt_text(message))
+        # Include the turn number so follow-up questions differ
+        return fake_response(f"{len(self._history)}\n" + "\n".join(self._history[-1:]), self._config)
+
+
+class _FakeChats:
+    def create(self, model: Optional[str] = None, config=None, history=None):
+        return _FakeChat(model, config)
+
+
+class _FakeAio:
+    def __init__(self):
+        self.models = _FakeModels()
+        self.chats = _FakeChats()
+
+
+class FakeClient:
+    """
+    Offline stand-in for `genai.Client` (selected with LLM_BACKEND=fake).
+    Only the async surface used through common/llm_gateway.py is provided.
+    """
+
+    def __init__(self):
+        self.aio = _FakeAio()
+
+
+if __name__ == "__main__":
+    # Quick look at what the fake returns for a prompt: python -m common.fake_llm "prompt"
+    import sys
+    print(json.dumps({"text": fake_response(" ".join(sys.argv[1:]) or "Summarize this video transcript").text}))
@@ -0,0 +1,90 @@
+import asyncio
+import importlib
+import inspect
+import threading
+import time
+from typing import Optional
+
+
+async def _run_handlers(handlers) -> None:
+    for handler in handlers:
+        result = handler()
+        if inspect.isawaitable(result):
+            await result
+
+
+class LazyApp:
+    """
+    ASGI app that imports a feature's FastAPI app on first use.
+
+    `target` is "module:attribute" (e.g. "mcq.app:app"). The import runs in
+    a worker thread so the server keeps serving other features while a heavy
+    one (torch, TensorFlow, ...) loads. Once imported, the sub-app's startup
+    handlers are run, which mounted apps otherwise never receive. If the
+    import fails, requests get a 503 with the error instead of crashing the server.
+    """
+
+    def __init__(self, name: str, target: str):
+        self.name = name
+        self.target = target
+        self.app = None
+        self.error: Optional[str] = None
+        self.load_seconds: Optional[float] = None
+        self._import_lock = threading.Lock()
+        self._startup_lock: Optional[asyncio.Lock] = None
+        self._started = False
+
+    def _import(self) -> None:
+        with self._import_lock:
+            if self.app is not None or self.error is not None:
+                return
+            module_name, attribute = self.target.split(":")
+            started = time.perf_counter()
+            try:
+                self.app = getattr(importlib.import_module(module_name), attribute)
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"[Features] {self.name} failed to load: {self.error}")
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            if self.app is not None:
+                print(f"[Features] {self.name} loaded in {self.load_seconds}s")
+
+    async def load(self):
+        """Import the app (once) and run its startup handlers. Returns None if it failed to load."""
+        if not self._started:
+            if self._startup_lock is None:
+                self._startup_lock = asyncio.Lock()
+            async with self._startup_lock:
+                if not self._started:
+                    await asyncio.to_thread(self._import)
+                    if self.app is not None:
+                        await _run_handlers(getattr(getattr(self.app, "router", None), "on_startup", []))
+                    self._started = True
+        return self.app
+
+    async def shutdown(self) -> None:
+        if self.app is not None and self._started:
+            await _run_handlers(getattr(getattr(self.app, "router", None), "on_shutdown", []))
+
+    def status(self) -> dict:
+        if self.error is not None:
+            state = "failed"
+        elif self._started:
+            state = "loaded"
+        else:
+            state = "loading" if self._import_lock.locked() else "not_loaded"
+        return {"target": self.target, "status": state, "load_seconds": self.load_seconds, "error": self.error}
+
+    async def __call__(self, scope, receive, send):
+        app = await self.load()
+        if app is not None:
+            await app(scope, receive, send)
+            return
+
+        if scope["type"] == "websocket":
+            await send({"type": "websocket.close", "code": 1011})
+            return
+        body = f'{{"detail": "Feature {self.name} is unavailable"}}'.encode("utf-8")
+        await send({"type": "http.response.start", "status": 503,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
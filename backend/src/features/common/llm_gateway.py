@@ -0,0 +1,131 @@
+import asyncio
+import os
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+from google import genai
+
+from common import metrics
+
+load_dotenv()
+
+# Shared settings for every Gemini call made by the feature apps
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", 90))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", 32))
+# "fake" swaps Gemini for the offline stand-in in common/fake_llm.py (benchmarks, local dev)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini")
+
+_client: Optional[genai.Client] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def get_client() -> genai.Client:
+    """Return the process-wide Gemini client so HTTP connections are reused."""
+    global _client
+    if _client is None:
+        if LLM_BACKEND == "fake":
+            from common.fake_llm import FakeClient
+            _client = FakeClient()
+        else:
+            _client = genai.Client(api_key=os.getenv("Test_API_KEY"))
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return _semaphore
+
+
+def default_model() -> Optional[str]:
+    return os.getenv("GEMINI_MODEL")
+
+
+def _record(model: Optional[str], operation: str, started: float, outcome: str, response=None) -> None:
+    model = model or "default"
+    metrics.llm_call_seconds.observe(time.perf_counter() - started, model=model,
+                                     operation=operation, outcome=outcome)
+    if response is not None:
+        metrics.record_llm_usage(model, response)
+
+
+async def generate_content(contents, config=None, model: Optional[str] = None,
+                           timeout: Optional[float] = None):
+    """
+    Non-blocking wrapper around `client.models.generate_content`.
+
+    Calls go through the SDK's async surface, are bounded by a shared
+    concurrency semaphore and are cancelled after `timeout` seconds.
+    """
+    client = get_client()
+    model = model or default_model()
+    async with _get_semaphore():
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(
+                client.aio.models.generate_content(model=model, contents=contents, config=config),
+                timeout=timeout or LLM_TIMEOUT_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            _record(model, "generate", started, "timeout")
+            raise
+        except Exception:
+            _record(model, "generate", started, "error")
+            raise
+        _record(model, "generate", started, "ok", response)
+        return response
+
+
+def create_chat(config=None, model: Optional[str] = None):
+    """Create an async chat session on the shared client."""
+    return get_client().aio.chats.create(model=model or default_model(), config=config)
+
+
+async def send_message(chat, message, timeout: Optional[float] = None):
+    """Send a message on a chat created with `create_chat`, with the same limits as `generate_content`."""
+    model = getattr(chat, "_model", None)
+    async with _get_semaphore():
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(chat.send_message(message), timeout=timeout or LLM_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            _record(model, "chat", started, "timeout")
+            raise
+        except Exception:
+            _record(model, "chat", started, "error")
+            raise
+        _record(model, "chat", started, "ok", response)
+        return response
+
+
+async def generate_content_stream(contents, config=None, model: Optional[str] = None,
+                                  timeout: Optional[float] = None):
+    """
+    Async iterator over streamed response chunks. The semaphore slot is held
+    until the stream finishes and `timeout` bounds the whole stream.
+    """
+    client = get_client()
+    model = model or default_model()
+    async with _get_semaphore():
+        started = time.perf_counter()
+        outcome, last_chunk = "error", None
+        try:
+            async with asyncio.timeout(timeout or LLM_TIMEOUT_SECONDS):
+                stream = await client.aio.models.generate_content_stream(
+                    model=model, contents=contents, config=config)
+                async for chunk in stream:
+                    last_chunk = chunk
+                    yield chunk
+            outcome = "ok"
+        except TimeoutError:
+            outcome = "timeout"
+            raise
+        except GeneratorExit:
+            # The caller stopped reading early (e.g. it already had enough questions)
+            outcome = "closed"
+            raise
+        finally:
+            # Usage metadata arrives with the final chunk
+            _record(model, "stream", started, outcome, last_chunk if outcome == "ok" else None)
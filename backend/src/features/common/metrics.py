@@ -0,0 +1,231 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+# Seconds; spans fast cache hits up to slow multi-call LLM requests
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_metrics: Dict[str, "_Metric"] = {}
+_collectors: List[Callable[[], Iterable[Tuple[str, str, dict, float]]]] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with _lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key: tuple, value) -> List[str]:
+        return [f"{self.name}{_format_labels(self._labels(key))} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with _lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with _lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _render_value(self, key: tuple, state) -> List[str]:
+        labels = self._labels(key)
+        lines, cumulative = [], 0
+        for upper, count in zip(self.buckets, state["counts"]):
+            cumulative += count
+            lines.append(f"{self.name}_bucket{_format_labels(labels | {'le': _format_value(upper)})} {cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels(labels | {'le': '+Inf'})} {state['count']}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(state['sum'])}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {state['count']}")
+        return lines
+
+
+def _get_or_create(cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = cls(name, documentation, labelnames, **kwargs)
+        return metric
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _get_or_create(Counter, name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _get_or_create(Gauge, name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+
+def register_collector(collect: Callable[[], Iterable[Tuple[str, str, dict, float]]]) -> None:
+    """
+    Add a callback run at scrape time that yields (name, help, labels, value)
+    gauge samples, for components that already keep their own counters
+    (cache stats, pool health, ...).
+    """
+    _collectors.append(collect)
+
+
+def register_cache(name: str, stats: Callable[[], dict]) -> None:
+    """Expose a cache's stats() hits/misses/evictions/size as gauges labelled cache=<name>."""
+    def collect():
+        values = stats()
+        evictions = values.get("evictions", 0)
+        if isinstance(evictions, dict):
+            evictions = sum(evictions.values())
+        yield "cache_hits", "Cache hits since start", {"cache": name}, values.get("hits", 0)
+        yield "cache_misses", "Cache misses since start", {"cache": name}, values.get("misses", 0)
+        yield "cache_hit_ratio", "Cache hits / lookups since start", {"cache": name}, values.get("hit_rate", 0.0)
+        yield "cache_evictions", "Cache evictions since start", {"cache": name}, evictions
+        yield "cache_entries", "Entries currently cached", {"cache": name}, values.get("entries", 0)
+    register_collector(collect)
+
+
+def render() -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    with _lock:
+        metrics = list(_metrics.values())
+    for metric in metrics:
+        lines.extend(metric.render())
+
+    collected: Dict[str, Tuple[str, List[str]]] = {}
+    for collect in list(_collectors):
+        try:
+            for name, documentation, labels, value in collect():
+                collected.setdefault(name, (documentation, []))[1].append(
+                    f"{name}{_format_labels(labels)} {_format_value(value)}")
+        except Exception as e:
+            print(f"[Metrics] collector failed: {e}")
+    for name, (documentation, samples) in collected.items():
+        lines.extend([f"# HELP {name} {documentation}", f"# TYPE {name} gauge", *samples])
+    return "\n".join(lines) + "\n"
+
+
+# ========= Shared instruments =========
+http_request_seconds = histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"))
+llm_call_seconds = histogram(
+    "llm_call_duration_seconds", "Gemini call duration", ("model", "operation", "outcome"))
+llm_tokens = counter("llm_tokens_total", "Gemini tokens from response usage metadata", ("model", "kind"))
+retries = counter("retries_total", "Retried operations by feature and stage", ("feature", "stage"))
+
+
+def record_llm_usage(model: str, response) -> None:
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for kind, field in (("prompt", "prompt_token_count"), ("output", "candidates_token_count"),
+                        ("thinking", "thoughts_token_count"), ("cached", "cached_content_token_count")):
+        value = getattr(usage, field, None)
+        if value:
+            llm_tokens.inc(value, model=model, kind=kind)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording http_request_duration_seconds. The route label
+    is the matched path template (e.g. /api/mcq/generate_mcq), so ids in
+    paths don't create new series; unmatched requests are labelled "unmatched".
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            template = getattr(route, "path", None)
+            label = f"{scope.get('root_path', '')}{template}" if template else "unmatched"
+            http_request_seconds.observe(time.perf_counter() - started, method=scope["method"],
+                                         route=label, status=status["code"])
@@ -0,0 +1,158 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from common import metrics
+
+
+class PoolBusyError(Exception):
+    """Raised when a pool's workers and queue are all taken; callers answer 503 or drop the work."""
+
+
+class FeaturePool:
+    """
+    Bounded executor for one feature's CPU-heavy work.
+
+    mode "process" runs work in `workers` spawned processes, outside the
+    server's GIL. "thread" uses a thread pool. At most `workers + max_queue`
+    calls are admitted at once and the rest are rejected straight away with
+    PoolBusyError, so a slow feature sheds load instead of queueing without bound.
+    Worker functions must be importable top-level functions.
+    """
+
+    def __init__(self, name: str, mode: str = "thread", workers: int = 1, max_queue: int = 8,
+                 initializer: Optional[Callable] = None, initargs: tuple = ()):
+        self.name = name
+        self.mode = mode
+        self.workers = workers
+        self.max_queue = max_queue
+        self.initializer = initializer
+        self.initargs = initargs
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.busy_seconds = 0.0
+        self._executor = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None:
+            if self.mode == "process":
+                # spawn, not fork: the server process may already hold torch/TensorFlow threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer, initargs=self.initargs)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix=f"{self.name}-pool",
+                    initializer=self.initializer, initargs=self.initargs)
+        return self._executor
+
+    @property
+    def down(self) -> bool:
+        """Shut down, or a process worker died and the pool can't take work until it restarts."""
+        return self._closed or bool(getattr(self._executor, "_broken", False))
+
+    async def run(self, fn: Callable, *args):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError(f"{self.name} pool is shut down")
+            if self.in_flight >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise PoolBusyError(f"{self.name} pool is busy")
+            self.in_flight += 1
+
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory): start a fresh pool for the next call
+            with self._lock:
+                self.restarts += 1
+                self._executor = None
+            self.failed += 1
+            raise
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.busy_seconds += time.perf_counter() - started
+            with self._lock:
+                self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    def health(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "restarts": self.restarts,
+            "avg_seconds": round(self.busy_seconds / finished, 4) if finished else None,
+            "saturated": self.in_flight >= self.workers + self.max_queue,
+            "down": self.down,
+        }
+
+    def shutdown(self) -> None:
+        self._closed = True
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pools: Dict[str, FeaturePool] = {}
+
+
+def get_pool(name: str, mode: str = "thread", workers: int = 1, max_queue: int = 8,
+             initializer: Optional[Callable] = None, initargs: tuple = ()) -> FeaturePool:
+    """
+    Process-wide pool registry. Every argument can be overridden per deployment
+    with <NAME>_POOL_MODE, <NAME>_POOL_WORKERS and <NAME>_POOL_QUEUE.
+    """
+    if name not in _pools:
+        prefix = name.upper()
+        _pools[name] = FeaturePool(
+            name,
+            mode=os.getenv(f"{prefix}_POOL_MODE", mode),
+            workers=int(os.getenv(f"{prefix}_POOL_WORKERS", workers)),
+            max_queue=int(os.getenv(f"{prefix}_POOL_QUEUE", max_queue)),
+            initializer=initializer,
+            initargs=initargs,
+        )
+    return _pools[name]
+
+
+def pool_health() -> dict:
+    return {name: pool.health() for name, pool in _pools.items()}
+
+
+def _collect_pool_metrics():
+    for name, health in pool_health().items():
+        labels = {"pool": name}
+        yield "pool_in_flight", "Calls running or queued in the pool", labels, health["in_flight"]
+        yield "pool_workers", "Configured pool workers", labels, health["workers"]
+        yield "pool_completed", "Calls completed since start", labels, health["completed"]
+        yield "pool_failed", "Calls failed since start", labels, health["failed"]
+        yield "pool_rejected", "Calls rejected by backpressure since start", labels, health["rejected"]
+
+
+metrics.register_collector(_collect_pool_metrics)
+
+
+def shutdown_pools() -> None:
+    for pool in _pools.values():
+        pool.shutdown()
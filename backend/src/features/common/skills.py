@@ -0,0 +1,163 @@
+import difflib
+import functools
+import json
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Set
+
+from common import metrics
+
+TAXONOMY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_taxonomy.json")
+# Typo-tolerant matching of skills the synonym tables don't know ("Pyhton"); off by default
+SKILL_FUZZY_MATCHING = os.getenv("SKILL_FUZZY_MATCHING", "0") == "1"
+SKILL_FUZZY_CUTOFF = float(os.getenv("SKILL_FUZZY_CUTOFF", 0.8))
+SKILL_CACHE_SIZE = int(os.getenv("SKILL_CACHE_SIZE", 8192))
+
+
+def normalize_skill(text: str) -> str:
+    """Lowercase, spell out C++/C# variants and collapse punctuation: "C plus plus" -> "c++"."""
+    text = (text or "").lower()
+    text = re.sub(r"\s*\bplus\s*plus\b", "++", text)
+    text = re.sub(r"\s*\bsharp\b", "#", text)
+    text = re.sub(r"\s+(?=\+\+|#)", "", text)
+    text = re.sub(r"[^\w+#./\- ]", " ", text)
+    text = re.sub(r"[\s\-_]+", " ", text)
+    return " ".join(token.rstrip(".") for token in text.split() if token.rstrip("."))
+
+
+def _compact(normalized: str) -> str:
+    # "node.js", "node js" and "nodejs" share one key
+    return normalized.replace(" ", "").replace(".", "")
+
+
+class SkillTaxonomy:
+    """
+    Canonical skill ids with their synonyms, from skill_taxonomy.json.
+
+    `canonical()` maps any spelling ("JS", "Javascript", "java script") to
+    one id through a precomputed hash index, so skill lists become sets
+    and matching is set membership. `find_in_text()` walks a token trie of
+    the aliases to pick skills out of free text (resumes, job descriptions).
+    A combined skill (DSA) also credits the skills it `includes`. Skills
+    the taxonomy doesn't know keep their normalized spelling as id.
+    """
+
+    def __init__(self, path: str = TAXONOMY_FILE, fuzzy: bool = SKILL_FUZZY_MATCHING,
+                 fuzzy_cutoff: float = SKILL_FUZZY_CUTOFF, cache_size: int = SKILL_CACHE_SIZE):
+        self.fuzzy = fuzzy
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self.names: Dict[str, str] = {}
+        self.includes: Dict[str, List[str]] = {}
+        self._index: Dict[str, str] = {}
+        self._compact_index: Dict[str, str] = {}
+        self._trie: dict = {}
+        self.fuzzy_matches = 0
+
+        with open(path, "r") as file:
+            data = json.load(file)
+        not_in_text = {normalize_skill(alias) for alias in data.get("not_in_text", [])}
+        for skill_id, entry in data["skills"].items():
+            self.names[skill_id] = entry["name"]
+            if entry.get("includes"):
+                self.includes[skill_id] = list(entry["includes"])
+            for alias in [skill_id, entry["name"], *entry.get("aliases", [])]:
+                normalized = normalize_skill(alias)
+                self._index.setdefault(normalized, skill_id)
+                self._compact_index.setdefault(_compact(normalized), skill_id)
+                # Ambiguous words ("go", "os", "rest") and one-letter names only match whole skill names
+                if len(normalized) > 1 and normalized not in not_in_text:
+                    self._add_to_trie(normalized.split(), skill_id)
+
+        self._resolve_cached = functools.lru_cache(maxsize=cache_size)(self._resolve)
+        self._extract_cached = functools.lru_cache(maxsize=cache_size)(
+            lambda skill: frozenset(self.find_in_text(skill)))
+
+    def _add_to_trie(self, tokens: List[str], skill_id: str) -> None:
+        node = self._trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault("$", skill_id)
+
+    def _resolve(self, skill: str) -> str:
+        normalized = normalize_skill(skill)
+        skill_id = self._index.get(normalized) or self._compact_index.get(_compact(normalized))
+        if skill_id is None and self.fuzzy and len(normalized) >= 4:
+            close = difflib.get_close_matches(normalized, self._index.keys(), n=1, cutoff=self.fuzzy_cutoff)
+            if close:
+                skill_id = self._index[close[0]]
+                self.fuzzy_matches += 1
+        return skill_id or normalized
+
+    def canonical(self, skill: str) -> str:
+        return self._resolve_cached(skill)
+
+    def is_known(self, skill_id: str) -> bool:
+        return skill_id in self.names
+
+    def display(self, skill_id: str) -> str:
+        return self.names.get(skill_id, skill_id)
+
+    def find_in_text(self, text: str) -> Set[str]:
+        """Known skills mentioned anywhere in `text`, longest alias first ("java ee" before "java")."""
+        tokens = normalize_skill(text).split()
+        found = set()
+        i = 0
+        while i < len(tokens):
+            node, match, match_end = self._trie, None, i
+            for j in range(i, len(tokens)):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                if "$" in node:
+                    match, match_end = node["$"], j + 1
+            if match is not None:
+                found.add(match)
+                found.update(self.includes.get(match, ()))
+                i = match_end
+            else:
+                i += 1
+        return found
+
+    def canonical_set(self, skills: Iterable[str], extract: bool = True) -> Set[str]:
+        """
+        Canonical ids for a list of skills. With `extract`, known skills
+        mentioned inside longer entries ("Python (Django, Flask)") count too.
+        """
+        ids = set()
+        for skill in skills:
+            skill_id = self.canonical(skill)
+            ids.add(skill_id)
+            ids.update(self.includes.get(skill_id, ()))
+            if extract:
+                ids |= self._extract_cached(skill)
+        return ids
+
+    def stats(self) -> dict:
+        info = self._resolve_cached.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            "skills": len(self.names),
+            "aliases": len(self._index),
+            "fuzzy": self.fuzzy,
+            "fuzzy_matches": self.fuzzy_matches,
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": round(info.hits / lookups, 4) if lookups else 0.0,
+            "entries": info.currsize,
+        }
+
+
+_taxonomy: Optional[SkillTaxonomy] = None
+_taxonomy_lock = threading.Lock()
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """The process-wide taxonomy, shared by the resume analyzer and the ATS scorer."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _taxonomy_lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy()
+                metrics.register_cache("skills", _taxonomy.stats)
+    return _taxonomy
@@ -4,19 +4,21 @@ import os
 from pydantic import BaseModel
 import json
 import uuid
-import cv2
-import numpy as np
 import asyncio
 import base64
+import time
 
-from .models.interviewbot import InterviewBot,CandidateInfo
+from common import metrics
+from common.process_pool import PoolBusyError, get_pool
 
-from .models.face_mesh_detector import get_eye_contact_ratio
-from .models.head_movement_tracker import detect_head_movement
-from .models.emotion_recognition import get_facial_expression_score
-from .utils.confidence_calculator import calculate_confidence
+from .models.interviewbot import InterviewBot,CandidateInfo
+from .frame_analysis import score_frame
 
 app = FastAPI()
+# DeepFace/MediaPipe frame scoring; INTERVIEW_FRAMES_POOL_MODE=process spreads it over cores.
+# When workers and queue are full, incoming frames are dropped rather than queued.
+frame_pool = get_pool("interview_frames", workers=1, max_queue=2)
+frame_seconds = metrics.histogram("interview_frame_seconds", "Video frame scoring time", ("outcome",))
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)  # Ensure the upload directory exists
 
@@ -31,12 +33,12 @@ class CandidateRequest(BaseModel):
     projects: str
 
 @app.post("/start_interview/")
-def start_interview(candidate: CandidateRequest):
+async def start_interview(candidate: CandidateRequest):
     candidate_info = CandidateInfo(**candidate.dict())
     bot = InterviewBot(candidate_info)
     session_id = str(uuid.uuid4())  
     interview_sessions[session_id] = bot
-    response = bot.start_interview()
+    response = await bot.start_interview()
     return {
         "session_id": session_id,
         "question": response['question'],
@@ -63,7 +65,7 @@ async def answer_question(session_id: str, audio_file: UploadFile = File(None),
             buffer.write(await audio_file.read())
     
     bot = interview_sessions[session_id]
-    response = bot.answerandquestion(file_path)
+    response = await bot.answerandquestion(file_path)
     
     return {
         "question": response["question"],
@@ -92,8 +94,9 @@ def get_results(session_id: str):
 @app.websocket("/video_stream")
 async def video_stream(websocket: WebSocket):
     await websocket.accept()
-    prev_frame = None
+    prev_frame_bytes = None
     confidence_scores = []
+    dropped_frames = 0
 
     try:
         while True:
@@ -109,22 +112,19 @@ async def video_stream(websocket: WebSocket):
                     continue
 
                 frame_bytes = base64.b64decode(frame_data)
-                frame_np = np.frombuffer(frame_bytes, dtype=np.uint8)
-                frame = cv2.imdecode(frame_np, cv2.IMREAD_COLOR)
-                if frame is None:
-                    continue
 
             except Exception as e:
                 print(f"Frame decoding error: {e}")
                 continue
 
+            started = time.perf_counter()
             try:
-                eye_contact = get_eye_contact_ratio(frame)
-                expression = get_facial_expression_score(frame)
-                head_movement_penalty = detect_head_movement(frame, prev_frame) if prev_frame is not None else 0
-                prev_frame = frame.copy()
-
-                score = calculate_confidence(eye_contact, expression, head_movement_penalty)
+                score = await frame_pool.run(score_frame, frame_bytes, prev_frame_bytes)
+                frame_seconds.observe(time.perf_counter() - started,
+                                      outcome="undecodable" if score is None else "scored")
+                if score is None:
+                    continue
+                prev_frame_bytes = frame_bytes
                 confidence_scores.append(score)
 
                 if len(confidence_scores) % 10 == 0:
@@ -133,8 +133,13 @@ async def video_stream(websocket: WebSocket):
                         "average_confidence_score": round(avg_score, 2)
                     })
 
+            except PoolBusyError:
+                dropped_frames += 1
+                frame_seconds.observe(time.perf_counter() - started, outcome="dropped")
+                continue
             except Exception as e:
                 print(f"Frame processing error: {e}")
+                frame_seconds.observe(time.perf_counter() - started, outcome="error")
                 continue
 
     except Exception as e:
@@ -151,7 +156,9 @@ async def video_stream(websocket: WebSocket):
 
             await websocket.send_json({
                 "average_confidence_score": round(final_avg, 2),
-                "final_suggestion": feedback
+                "final_suggestion": feedback,
+                "frames_scored": len(confidence_scores),
+                "frames_dropped": dropped_frames
             })
 
             await asyncio.sleep(0.2)  # brief delay to ensure message is sent
@@ -0,0 +1,27 @@
+import cv2
+import numpy as np
+
+from .models.emotion_recognition import get_facial_expression_score
+from .models.face_mesh_detector import get_eye_contact_ratio
+from .models.head_movement_tracker import detect_head_movement
+from .utils.confidence_calculator import calculate_confidence
+
+
+def decode_frame(frame_bytes: bytes):
+    return cv2.imdecode(np.frombuffer(frame_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+
+def score_frame(frame_bytes: bytes, prev_frame_bytes: bytes | None = None) -> float | None:
+    """
+    Confidence score of one encoded video frame, or None if it can't be decoded.
+    Runs in the interview frame pool, so it takes and returns plain picklable values.
+    """
+    frame = decode_frame(frame_bytes)
+    if frame is None:
+        return None
+    prev_frame = decode_frame(prev_frame_bytes) if prev_frame_bytes else None
+
+    eye_contact = get_eye_contact_ratio(frame)
+    expression = get_facial_expression_score(frame)
+    head_movement_penalty = detect_head_movement(frame, prev_frame) if prev_frame is not None else 0
+    return calculate_confidence(eye_contact, expression, head_movement_penalty)
@@ -1,11 +1,13 @@
 import os
 import json
+import asyncio
 from google import genai
 from dotenv import load_dotenv
 import regex as re
 from pydantic import BaseModel
 from typing import Literal
 from ..utils.tts import text_to_speech
+from common import llm_gateway
 from pprint import pprint
 from google.genai import types
 import sounddevice as sd
@@ -59,7 +61,6 @@ class InterviewBot:
     def __init__(self, candidate_info: CandidateInfo):
         self.chat_history = []
         self.candidate_info = candidate_info
-        self.client = genai.Client(api_key=os.getenv("Test_API_KEY"))
         self.evaluations = {}
         self.qno = 0
         self.current_question:InterviewQuestion = InterviewQuestion(
@@ -69,7 +70,7 @@ class InterviewBot:
         )
         self.interview_done = False
         self.config = types.GenerateContentConfig(system_instruction=system_instruction,temperature=0.3,response_mime_type="application/json",response_schema=InterviewQuestion)
-        self.chat_session = self.client.chats.create(model=model,config=self.config)
+        self.chat_session = llm_gateway.create_chat(model=model,config=self.config)
 
     def generate_prompt(self):
         return f"""
@@ -106,10 +107,10 @@ class InterviewBot:
             pprint(f"Error removing pronunciations: {e}")
             return text
 
-    def start_interview(self):
+    async def start_interview(self):
         try:
             prompt = self.generate_prompt()
-            response = self.chat_session.send_message(prompt)
+            response = await llm_gateway.send_message(self.chat_session, prompt)
             
             self.current_question = response.parsed
             pprint(response.parsed)
@@ -119,7 +120,7 @@ class InterviewBot:
             
             question_text = str(self.current_question.question)
             difficulty = str(self.current_question.difficulty_level)
-            file = str(text_to_speech(question_text))
+            file = str(await asyncio.to_thread(text_to_speech, question_text))
             self.qno += 1
             pprint(question_text)
 
@@ -133,7 +134,7 @@ class InterviewBot:
             pprint(f"Error starting interview: {error_trace}")
             return {"error": "Failed to start interview"}
 
-    def evaluate_answer_with_llm(self, question, answer_audio):
+    async def evaluate_answer_with_llm(self, question, answer_audio):
         try:
             with open(answer_audio, 'rb') as audio_file:
                 audio_content = audio_file.read()
@@ -159,7 +160,7 @@ class InterviewBot:
             """
 
 
-            evaluation =self.client.models.generate_content(model=model, contents=[evaluation_prompt,types.Part.from_bytes(data=audio_content,mime_type="audio/wav")],config = types.GenerateContentConfig(temperature=0.2,response_mime_type="application/json",response_schema=Evaluation))
+            evaluation =await llm_gateway.generate_content(model=model, contents=[evaluation_prompt,types.Part.from_bytes(data=audio_content,mime_type="audio/wav")],config = types.GenerateContentConfig(temperature=0.2,response_mime_type="application/json",response_schema=Evaluation))
             evaluation = evaluation.parsed
             pprint(evaluation)
             self.evaluations[self.current_question.question] = evaluation.model_dump()
@@ -168,7 +169,7 @@ class InterviewBot:
             pprint(f"Error evaluating answer: {e}")
             
     
-    def answerandquestion(self, audio_file):
+    async def answerandquestion(self, audio_file):
         try:
             # if audio_file:
             #     transcript = transcribe(audio_file)
@@ -188,15 +189,15 @@ class InterviewBot:
             # file =text_to_speech(response_formatted['question'])
             # self.current_question = self.remove_pronunciations(response_formatted['question'])
             if audio_file:
-                transcript = self.evaluate_answer_with_llm(self.current_question.question, audio_file)
+                transcript = await self.evaluate_answer_with_llm(self.current_question.question, audio_file)
                 if transcript is None:
                     transcript = "No answer Provided"
-                response = self.chat_session.send_message(transcript)
+                response = await llm_gateway.send_message(self.chat_session, transcript)
                 self.current_question = response.parsed
                 pprint(response.text.strip())
             os.remove(audio_file)
                 
-            file = text_to_speech(self.current_question.question)
+            file = await asyncio.to_thread(text_to_speech, self.current_question.question)
             self.qno += 1
             return{
                 "question": self.current_question.question,
@@ -236,15 +237,19 @@ if __name__ == "__main__":
         experience="2 years",
         projects="AI-based Interview Bot, Chatbot with RAG"
     )
-    bot = InterviewBot(candidate_info=candidate)
-    response = bot.start_interview()
-    pprint(response)
-    while True:
-        user = record_audio()
-        response = bot.answerandquestion("answer.wav")
+    async def run_interview(bot):
+        # Run the whole session on one event loop so the async chat keeps its connection
+        response = await bot.start_interview()
         pprint(response)
-        if response["interview_done"]:
-            break
+        while True:
+            user = await asyncio.to_thread(record_audio)
+            response = await bot.answerandquestion("answer.wav")
+            pprint(response)
+            if response["interview_done"]:
+                break
+
+    bot = InterviewBot(candidate_info=candidate)
+    asyncio.run(run_interview(bot))
 
     response = bot.exit_interview()
     pprint(response)
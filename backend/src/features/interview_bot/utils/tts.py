@@ -25,12 +25,31 @@ import sounddevice as sd
 #     return "output.wav"
         
 
+import os
+import time
+import numpy as np
 from murf import Murf
 import requests
+
+# "fake" writes silence instead of calling Murf (benchmarks, local dev)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "murf")
+FAKE_TTS_LATENCY_MS = float(os.getenv("FAKE_TTS_LATENCY_MS", 0))
+
 client = Murf(
     api_key="ap2_de614dcc-fdee-4ce7-a9f7-4d2b08e32854" # Not required if you have set the MURF_API_KEY environment variable
 )
+def fake_text_to_speech(text, filename="uploads/output.wav", samplerate=24000):
+    # Roughly speaking time: 150 words a minute
+    if FAKE_TTS_LATENCY_MS:
+        time.sleep(FAKE_TTS_LATENCY_MS / 1000)
+    seconds = max(0.5, len(text.split()) / 2.5)
+    sf.write(filename, np.zeros(int(seconds * samplerate), dtype=np.float32), samplerate)
+    return filename
+
+
 def text_to_speech(text, filename="uploads/output.wav"):
+    if TTS_BACKEND == "fake":
+        return fake_text_to_speech(text, filename)
     res = client.text_to_speech.generate(
         text=text,
         voice_id="en-US-terrell"
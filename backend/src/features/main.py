@@ -1,7 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+import asyncio
 import os
 import sys
+import time
+
+from common import metrics
+
+_started_at = time.perf_counter()
 
 # Add the project root directory to Python path
 project_root = os.path.abspath(os.path.join(
@@ -28,6 +35,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency histograms for every mounted feature, scraped from /metrics
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Set the working directory to 'backend'
 # Get the directory of the script
 script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -42,34 +52,96 @@ os.chdir(backend_dir)
 # Verify the change
 print("Current Working Directory:", os.getcwd())
 
-from resume_analyzer.app import app as resume_analyzer_app
-from ats_score.app import app as ats_score_app
-from mcq.app import app as mcq_app
-#from attention_tracker.app import app as attention_tracker_app
-from interview_bot.app import app as interview_bot_app
-from youtube_transcript.app import app as youtube_app
+from common.lazy_app import LazyApp
+from common.process_pool import pool_health, shutdown_pools
+
+# Feature apps are imported on their first request (or preloaded in the background
+# after startup), so the server binds without paying for torch/TensorFlow/etc.
+# name: (mount prefix, app import path)
+FEATURES = {
+    "ats": ("/api/ats", "ats_score.app:app"),
+    "resume": ("/api/resume", "resume_analyzer.app:app"),
+    "mcq": ("/api/mcq", "mcq.app:app"),
+    #"attention": ("/api/attention", "attention_tracker.app:app"),
+    "interview": ("/api/interview", "interview_bot.app:app"),
+    "youtube": ("/api/youtube", "youtube_transcript.app:app"),
+}
+
+# Per deployment: ENABLED_FEATURES="resume,ats" (default: all), DISABLED_FEATURES="interview"
+enabled = os.getenv("ENABLED_FEATURES", "all").replace(" ", "")
+disabled = set(filter(None, os.getenv("DISABLED_FEATURES", "").replace(" ", "").split(",")))
+ENABLED_FEATURES = [name for name in FEATURES
+                    if (enabled == "all" or name in enabled.split(",")) and name not in disabled]
+# "background" imports enabled features after startup, "eager" before serving, "none" only on demand
+FEATURE_PRELOAD = os.getenv("FEATURE_PRELOAD", "background")
+
+feature_apps = {name: LazyApp(name, FEATURES[name][1]) for name in ENABLED_FEATURES}
 
 # Mount feature routes with proper prefixes
-app.mount("/api/ats", ats_score_app)
-app.mount("/api/resume", resume_analyzer_app)
-app.mount("/api/mcq", mcq_app)
-#app.mount("/api/attention", attention_tracker_app)
-app.mount("/api/interview", interview_bot_app)
-app.mount("/api/youtube", youtube_app)
+for name, feature_app in feature_apps.items():
+    app.mount(FEATURES[name][0], feature_app)
+
+startup_report = {"startup_seconds": None, "preload": FEATURE_PRELOAD}
+
+async def preload_features():
+    for feature_app in feature_apps.values():
+        await feature_app.load()
+    startup_report["preload_seconds"] = round(time.perf_counter() - _started_at, 3)
+    print(f"[Features] preload finished in {startup_report['preload_seconds']}s")
+
+@app.on_event("startup")
+async def startup_event():
+    if FEATURE_PRELOAD == "eager":
+        await preload_features()
+    elif FEATURE_PRELOAD == "background":
+        app.state.preload_task = asyncio.create_task(preload_features())
+    startup_report["startup_seconds"] = round(time.perf_counter() - _started_at, 3)
+    print(f"[Startup] ready in {startup_report['startup_seconds']}s, features: {', '.join(feature_apps) or 'none'}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for feature_app in feature_apps.values():
+        await feature_app.shutdown()
+    shutdown_pools()
+
+@app.get("/features")
+def features():
+    """Startup timing and per-feature load status."""
+    return startup_report | {"features": {name: feature_app.status() for name, feature_app in feature_apps.items()}}
+
+FEATURE_DESCRIPTIONS = {
+    "resume": "/api/resume/analyze - Resume Analysis",
+    "ats": "/api/ats/score - ATS Scoring",
+    "mcq": "/api/mcq - MCQ Generator",
+    "youtube": "/api/youtube - YouTube Learning",
+    "interview": "/api/interview - Interview Bot",
+}
+
+@app.get("/health")
+def health():
+    """
+    Feature load status plus worker pool load. 503 only if a feature failed to
+    load or a pool is down; a saturated pool is shedding load by design (the
+    interview frame pool drops frames under normal streaming) and is only reported.
+    """
+    features = {name: feature_app.status()["status"] for name, feature_app in feature_apps.items()}
+    pools = pool_health()
+    healthy = "failed" not in features.values() and not any(pool["down"] for pool in pools.values())
+    return JSONResponse(status_code=200 if healthy else 503,
+                        content={"status": "ok" if healthy else "degraded", "features": features, "pools": pools,
+                                 "saturated_pools": [name for name, pool in pools.items() if pool["saturated"]]})
+
+@app.get("/metrics")
+def prometheus_metrics():
+    """Prometheus text format: route latency, LLM calls/tokens, retries, cache hit rates, pools, frames."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 # Root endpoint
 @app.get("/")
 def read_root():
     return {
         "message": "Welcome to Resume Analysis Platform",
-        "features": [
-            "/api/resume/analyze - Resume Analysis",
-            "/api/ats/score - ATS Scoring",
-            "/api/mcq - MCQ Generator",
-            "/api/youtube - YouTube Learning"
-            "/api/interview - Interview Bot",
-
-        ]
+        "features": [description for name, description in FEATURE_DESCRIPTIONS.items() if name in feature_apps]
     }
 
 if __name__ == "__main__":
@@ -1,14 +1,21 @@
 from fastapi import FastAPI, Request, Form, HTTPException
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import JSONResponse, HTMLResponse, StreamingResponse
 import json
 import os
-from google import genai
+import asyncio
+from contextlib import aclosing
 from google.genai import types
 from typing import Optional, List
-from pydantic import BaseModel, Field
-import time
+from pydantic import BaseModel, Field, ValidationError
+
+from common import llm_gateway, metrics
+from common.disk_cache import DiskCache, make_cache_key
+from .question_bank import (QuestionBank, bucket_key, is_near_duplicate, load_seed_buckets,
+                            question_fingerprint)
+from .stream_parser import QuestionStreamParser
+from .topic_catalogue import TopicCatalogue
 
 # Initialize FastAPI app
 app = FastAPI()
@@ -19,20 +26,61 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # Set the correct path for static files and topics JSON
 STATIC_DIR = os.path.join(BASE_DIR, "static")
 TOPICS_FILE_PATH = os.path.join(STATIC_DIR, "topics_and_subtopics.json")
+OVERVIEW_FILE_PATH = os.path.join(BASE_DIR, "overview.json")
+
+# Topics are loaded once and reloaded only when the files change on disk
+topic_catalogue = TopicCatalogue(TOPICS_FILE_PATH, OVERVIEW_FILE_PATH)
 
 # Configure templates and static files
 templates = Jinja2Templates(directory=os.path.join(BASE_DIR, "templates"))
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# Configure Gemini client
-client = genai.Client(api_key=os.getenv("Test_API_KEY"))
+# Gemini calls go through the shared async gateway
 model = os.getenv("GEMINI_MODEL")
 
+# Generation runs at temperature 0, so identical requests can be served from disk
+MCQ_CACHE_PATH = os.getenv("MCQ_CACHE_PATH", os.path.join(BASE_DIR, "cache", "mcq_cache.sqlite3"))
+mcq_cache = DiskCache(
+    MCQ_CACHE_PATH,
+    ttl_seconds=float(os.getenv("MCQ_CACHE_TTL_SECONDS", 7 * 24 * 3600)),
+    max_entries=int(os.getenv("MCQ_CACHE_MAX_ENTRIES", 500)),
+    max_bytes=int(os.getenv("MCQ_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+)
+metrics.register_cache("mcq", mcq_cache.stats)
+
+# "sharded" splits the 15 questions into concurrent smaller requests
+MCQ_GENERATION_MODE = os.getenv("MCQ_GENERATION_MODE", "single").lower()
+MCQ_SHARD_SIZE = int(os.getenv("MCQ_SHARD_SIZE", 5))
+# "count" gives every shard the requested topic, "topic" spreads mixed requests over subtopics
+MCQ_SHARD_BY = os.getenv("MCQ_SHARD_BY", "count").lower()
+MCQ_SHARD_MAX_RETRIES = int(os.getenv("MCQ_SHARD_MAX_RETRIES", 3))
+
+# Pre-generated question bank, filled in the background and sampled per request.
+# Opt-in: while enabled, each worker process spends Gemini calls warming the seed
+# buckets (one call per fill, up to MCQ_BANK_WARM_MAX_FILLS) and topping up buckets
+# that live traffic drains, and responses are sampled from the bank instead of
+# freshly generated.
+MCQ_BANK_ENABLED = os.getenv("MCQ_BANK_ENABLED", "false").lower() == "true"
+MCQ_BANK_PATH = os.getenv("MCQ_BANK_PATH", os.path.join(BASE_DIR, "cache", "question_bank.sqlite3"))
+MCQ_BANK_TARGET_SIZE = int(os.getenv("MCQ_BANK_TARGET_SIZE", 60))
+MCQ_BANK_LOW_WATER = int(os.getenv("MCQ_BANK_LOW_WATER", 30))
+MCQ_BANK_TEMPERATURE = float(os.getenv("MCQ_BANK_TEMPERATURE", 0.9))
+MCQ_BANK_FILL_INTERVAL_SECONDS = float(os.getenv("MCQ_BANK_FILL_INTERVAL_SECONDS", 2))
+# "mixed" warms only the all-topics buckets; "all" also warms every individual topic
+MCQ_BANK_WARM_TOPICS = os.getenv("MCQ_BANK_WARM_TOPICS", "mixed").lower()
+# Upper bound on warm-up fills per process; 0 disables warm-up (top-ups still run)
+MCQ_BANK_WARM_MAX_FILLS = int(os.getenv("MCQ_BANK_WARM_MAX_FILLS", 20))
+question_bank = QuestionBank(MCQ_BANK_PATH)
+bank_topup_queue: asyncio.Queue = asyncio.Queue()
+bank_pending = set()
+bank_worker_task: Optional[asyncio.Task] = None
+
 # Define a Pydantic model for the MCQ request (input validation)
 class MCQRequest(BaseModel):
     subject: str
     difficulty: str
     topic: Optional[str] = "NA"
+    mode: Optional[str] = None  # "single" or "sharded"; defaults to MCQ_GENERATION_MODE
 
 # Define Pydantic models for the MCQ response (output validation and schema generation)
 class MCQOption(BaseModel):
@@ -69,25 +117,90 @@ async def startup_event():
         with open(TOPICS_FILE_PATH, 'w') as file:
             json.dump(default_topics, file, indent=4)
 
+    ensure_bank_worker()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if bank_worker_task is not None:
+        bank_worker_task.cancel()
+
 # Load topics and subtopics for the dropdown
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
-    if not os.path.exists(TOPICS_FILE_PATH):
+    topics_data = topic_catalogue.data
+    if not topics_data:
         raise HTTPException(
             status_code=500, detail=f"File not found: {TOPICS_FILE_PATH}")
 
-    with open(TOPICS_FILE_PATH, 'r') as file:
-        topics_data = json.load(file)
-
     return templates.TemplateResponse("index.html", {"request": request, "topics_data": topics_data})
 
 
 @app.post("/generate_mcq", response_model=MCQResponse) # Specify response_model here
 async def generate_mcq(request: Request, mcq_request: MCQRequest = None):
-    if not os.path.exists(TOPICS_FILE_PATH):
+    subject, difficulty, topic = await read_mcq_request(request, mcq_request)
+    mode = ((mcq_request.mode if mcq_request else None) or MCQ_GENERATION_MODE).lower()
+
+    if MCQ_BANK_ENABLED:
+        ensure_bank_worker()
+        questions = question_bank.sample(subject, topic, difficulty, 15)
+        if question_bank.count(subject, topic, difficulty) < MCQ_BANK_LOW_WATER:
+            request_bank_topup(subject, topic, difficulty)
+        if questions is not None:
+            return MCQResponse(questions=questions)
+
+    cache_key = mcq_cache_key(subject, difficulty, topic)
+    cached = mcq_cache.get(cache_key)
+    if cached is not None:
+        return MCQResponse.model_validate_json(cached)
+
+    topic_reference = topic_catalogue.prompt_fragment(subject)
+
+    try:
+        if mode == "sharded":
+            mcq_data = await generate_mcqs_sharded(
+                subject, difficulty, topic, topic_reference)
+        else:
+            mcq_data = await generate_mcqs_with_ai(
+                subject, difficulty, topic, topic_reference)
+        mcq_cache.set(cache_key, mcq_data.model_dump_json())
+        if MCQ_BANK_ENABLED:
+            question_bank.add(subject, topic, difficulty,
+                              [question.model_dump() for question in mcq_data.questions])
+
+        # FastAPI will now validate mcq_data against MCQResponse and serialize it.
+        return mcq_data
+    except HTTPException:
+        raise
+    except json.JSONDecodeError:
         raise HTTPException(
-            status_code=500, detail=f"File not found: {TOPICS_FILE_PATH}")
+            status_code=500, detail="Failed to parse AI response. AI did not return valid JSON.")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+@app.post("/generate_mcq/stream")
+async def generate_mcq_stream(request: Request, mcq_request: MCQRequest = None):
+    """
+    NDJSON variant of /generate_mcq. Each line is an event:
+    {"type": "question", "question": {...}} as soon as a question is complete,
+    then {"type": "done", "count": n} or {"type": "error", "detail": "..."}.
+    """
+    subject, difficulty, topic = await read_mcq_request(request, mcq_request)
+
+    async def events():
+        count = 0
+        try:
+            async for question in stream_mcqs(subject, difficulty, topic):
+                count += 1
+                yield json.dumps({"type": "question", "question": question.model_dump()}) + "\n"
+            yield json.dumps({"type": "done", "count": count}) + "\n"
+        except HTTPException as e:
+            yield json.dumps({"type": "error", "detail": e.detail, "count": count}) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "detail": f"An error occurred: {str(e)}", "count": count}) + "\n"
 
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+async def read_mcq_request(request: Request, mcq_request: Optional[MCQRequest]):
     if not mcq_request:
         form_data = await request.form()
         subject = form_data.get('subject')
@@ -98,134 +211,308 @@ async def generate_mcq(request: Request, mcq_request: MCQRequest = None):
         difficulty = mcq_request.difficulty
         topic = mcq_request.topic
 
-    with open(TOPICS_FILE_PATH, 'r') as file:
-        topics_and_subtopics = json.load(file)
+    if not topic_catalogue.subjects:
+        raise HTTPException(
+            status_code=500, detail=f"File not found: {TOPICS_FILE_PATH}")
 
+    # Reject bad input before spending an LLM call on it
     try:
-        mcq_data = generate_mcqs_with_ai(
-            subject, difficulty, topic, topics_and_subtopics)
+        return topic_catalogue.resolve(subject, difficulty, topic)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def stream_mcqs(subject, difficulty, topic, total=15):
+    # Ready-made sets (bank or cache) are replayed immediately
+    if MCQ_BANK_ENABLED:
+        ensure_bank_worker()
+        questions = question_bank.sample(subject, topic, difficulty, total)
+        if question_bank.count(subject, topic, difficulty) < MCQ_BANK_LOW_WATER:
+            request_bank_topup(subject, topic, difficulty)
+        if questions is not None:
+            for question in questions:
+                yield MCQQuestion(**question)
+            return
+
+    cache_key = mcq_cache_key(subject, difficulty, topic)
+    cached = mcq_cache.get(cache_key)
+    if cached is not None:
+        for question in MCQResponse.model_validate_json(cached).questions:
+            yield question
+        return
+
+    topic_reference = topic_catalogue.prompt_fragment(subject)
+
+    questions = []
+    async for question in stream_mcqs_with_ai(subject, difficulty, topic, topic_reference, total):
+        questions.append(question)
+        yield question
+
+    mcq_cache.set(cache_key, MCQResponse(questions=questions).model_dump_json())
+    if MCQ_BANK_ENABLED:
+        question_bank.add(subject, topic, difficulty,
+                          [question.model_dump() for question in questions])
+
+async def stream_mcqs_with_ai(subject, difficulty, topic, topic_reference, total=15, temperature=0.0):
+    """
+    Yield validated questions while the model is still writing the rest.
+    If the stream ends short, only the missing questions are requested again.
+    """
+    max_retries = 3
+    retry_count = 0
+    questions = []
+    seen = set()
 
-        # FastAPI will now validate mcq_data against MCQResponse and serialize it.
-        return mcq_data
-    except json.JSONDecodeError:
-        raise HTTPException(
-            status_code=500, detail="Failed to parse AI response. AI did not return valid JSON.")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+    while len(questions) < total and retry_count < max_retries:
+        missing = total - len(questions)
+        prompt = build_mcq_prompt(
+            subject, difficulty, topic, topic_reference, count=missing,
+            start_id=len(questions) + 1, exclude=[question.question_text for question in questions])
+        parser = QuestionStreamParser()
+
+        try:
+            # aclosing releases the gateway's concurrency slot as soon as we stop reading
+            async with aclosing(llm_gateway.generate_content_stream(
+                model=model,
+                contents=prompt,
+                config={
+                    "response_mime_type": "application/json",
+                    "response_schema": MCQResponse,
+                    "temperature": temperature,
+                }
+            )) as stream:
+                async for chunk in stream:
+                    for raw_question in parser.feed(chunk.text or ""):
+                        try:
+                            question = MCQQuestion.model_validate(raw_question)
+                        except ValidationError as e:
+                            print(f"Skipping invalid streamed question: {e}")
+                            continue
+
+                        fingerprint = question_fingerprint(question.question_text)
+                        if fingerprint in seen:
+                            continue
+                        seen.add(fingerprint)
+
+                        question.id = len(questions) + 1
+                        questions.append(question)
+                        yield question
+                        if len(questions) == total:
+                            return
+        except Exception as e:
+            print(f"Error during Gemini stream: {e}")
+
+        if len(questions) < total:
+            print(f"Stream ended with {len(questions)}/{total} questions, requesting the rest")
+            retry_count += 1
+            metrics.retries.inc(feature="mcq", stage="stream")
+            await asyncio.sleep(1)
+
+    if len(questions) < total:
+        raise HTTPException(status_code=500, detail=f"Failed to generate {total} questions after multiple retries")
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return mcq_cache.stats()
+
+@app.get("/bank/stats")
+async def bank_stats():
+    return question_bank.stats() | {"enabled": MCQ_BANK_ENABLED, "pending_topups": len(bank_pending),
+                                    "warm_max_fills": MCQ_BANK_WARM_MAX_FILLS}
+
+def ensure_bank_worker():
+    # Mounted sub-apps don't receive startup events, so the first request starts the worker too
+    global bank_worker_task
+    if MCQ_BANK_ENABLED and (bank_worker_task is None or bank_worker_task.done()):
+        bank_worker_task = asyncio.create_task(question_bank_worker())
+
+def request_bank_topup(subject, topic, difficulty):
+    key = bucket_key(subject, topic, difficulty)
+    if key not in bank_pending:
+        bank_pending.add(key)
+        bank_topup_queue.put_nowait((subject, topic, difficulty))
+
+async def fill_bank_bucket(subject, topic, difficulty) -> int:
+    topic_reference = topic_catalogue.prompt_fragment(subject)
+
+    # Sample at a higher temperature so repeated fills yield new questions
+    mcq_data = await generate_mcqs_with_ai(
+        subject, difficulty, topic, topic_reference, temperature=MCQ_BANK_TEMPERATURE)
+    return question_bank.add(subject, topic, difficulty,
+                             [question.model_dump() for question in mcq_data.questions])
+
+async def question_bank_worker():
+    seeds = load_seed_buckets(topic_catalogue, include_topics=MCQ_BANK_WARM_TOPICS == "all")
+    exhausted = set()
+    warm_fills = 0
+
+    while True:
+        # Top-ups requested by live traffic go first, then warm-up of the seed buckets
+        try:
+            bucket = bank_topup_queue.get_nowait()
+        except asyncio.QueueEmpty:
+            bucket = None
+            if warm_fills < MCQ_BANK_WARM_MAX_FILLS:
+                bucket = next((seed for seed in seeds
+                               if bucket_key(*seed) not in exhausted
+                               and question_bank.count(*seed) < MCQ_BANK_TARGET_SIZE), None)
+            if bucket is None:
+                bucket = await bank_topup_queue.get()
+            else:
+                warm_fills += 1
+
+        key = bucket_key(*bucket)
+        try:
+            added = await fill_bank_bucket(*bucket)
+            print(f"Question bank: added {added} questions to {key}")
+            if added == 0:
+                # The model keeps returning questions we already have; stop warming this bucket
+                exhausted.add(key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Question bank fill failed for {key}: {e}")
+        finally:
+            bank_pending.discard(key)
+
+        await asyncio.sleep(MCQ_BANK_FILL_INTERVAL_SECONDS)
+
+def mcq_cache_key(subject, difficulty, topic):
+    # Normalise the inputs so "os"/"OS" and "na"/"NA" share one entry
+    topic = (topic or "NA").strip()
+    if topic.lower() == "na":
+        topic = "NA"
+    return make_cache_key(
+        "mcq", model, (subject or "").strip().upper(), (difficulty or "").strip().capitalize(), topic.lower())
 
-def generate_mcqs_with_ai(subject, difficulty, topic, topics_and_subtopics):
+def build_mcq_prompt(subject, difficulty, topic, topic_reference, count=15, start_id=1, exclude=None):
     delimiter = "####"
+    # Keep the original 6-in-15 share of numerical questions for partial batches
+    numerical = round(count * 6 / 15)
+    prompt = f"""
+    You are an expert educational content creator specializing in Computer Science subjects. Your task is to generate high-quality technical questions based on user specifications.
+
+    {delimiter}
+    Context:
+    You will receive three key inputs:
+    1. Subject(`{subject}`) (One of: OS, CN, OOPS, DBMS)
+    2. Difficulty Level(`{difficulty}`)(Easy, Medium, Hard)
+    3. Topic(`{topic}`): Specific topics within the subject. This is an optional input. If the user inputs "NA","Na" OR "na" simply mix all the topics and create the questions. You can refer to the available topics: {topic_reference}.
+    {delimiter}
+
+    {delimiter}
+    Question Distribution:
+    - Generate exactly {count} questions total
+    - Include exactly {numerical} numerical problem-solving questions per subject
+    - Ensure even distribution across specified topics when multiple topics are provided
+    {delimiter}
+
+    {delimiter}
+    Question Quality Requirements:
+    1. Technical Accuracy:
+    - Generate only factually correct questions based on established CS principles
+    - Avoid any hallucinations or speculative content
+    - Include only industry-standard, verified information
+
+    2. Conceptual Testing:
+    - Focus on testing deep understanding rather than memorization
+    - Include questions that require problem-solving skills
+    - Test application of concepts in practical scenarios
+    - Incorporate questions that connect multiple related concepts
+
+    3. Option Design Requirements:
+    - Include plausible distractors that represent common misconceptions
+    - Vary the length of correct answers (avoid making the longest option always correct)
+    - Strategically include "All of the above" or "None of the above" options
+    - Distribute correct answers evenly among A, B, C, and D (avoid answer bias)
+    - Ensure options are mutually exclusive and collectively exhaustive
+
+    4. Bias Prevention:
+    - Use neutral language
+    - Avoid culture-specific references
+    - Ensure questions are accessible to all skill levels within the specified difficulty
+    - Remove any gender, age, or geographic biases
+    - Use inclusive technical scenarios
+    {delimiter}
+
+    {delimiter}
+    Difficulty Calibration:
+    1. Easy:
+    - Basic concept application
+    - Single-step problem solving
+    - Direct recall and understanding
+
+    2. Medium:
+    - Multi-step problem solving
+    - Concept integration
+    - Practical application scenarios
+
+    3. Hard:
+    - Complex problem analysis
+    - Multiple concept integration
+    - Advanced application scenarios
+    - Edge case considerations
+    {delimiter}
+
+    {delimiter}
+    Output Format:
+    Strictly adhere to this JSON format:
+    {{
+      "questions": [
+        {{
+          "id": number,
+          "subject": "string",
+          "topic": "string",
+          "difficulty": "string",
+          "question_type": "multiple_choice",
+          "question_text": "string",
+          "options": [
+            {{"key": "A", "text": "string"}},
+            {{"key": "B", "text": "string"}},
+            {{"key": "C", "text": "string"}},
+            {{"key": "D", "text": "string"}}
+          ],
+          "correct_answer": "string",
+          "explanation": "string",
+          "status": "original"
+        }}
+      ]
+    }}
+    {delimiter}
+
+    {delimiter}
+    IMPORTANT:
+    - Return exactly {count} questions in the specified JSON format.
+    - Do not include any additional text or explanations.
+    - Ensure the JSON is valid and properly formatted.
+    {delimiter}
+    """
+    if exclude:
+        # Top-up requests must not repeat questions the student already has
+        existing = "\n".join(f"    - {text}" for text in exclude)
+        prompt += f"""
+    {delimiter}
+    Already generated (do not repeat or paraphrase these questions):
+{existing}
+    Number the new questions starting from id {start_id}.
+    {delimiter}
+    """
+    return prompt
+
+async def generate_mcqs_with_ai(subject, difficulty, topic, topic_reference, temperature=0.0):
     max_retries = 3
     retry_count = 0
 
     while retry_count < max_retries:
         try:
-            prompt = f"""
-            You are an expert educational content creator specializing in Computer Science subjects. Your task is to generate high-quality technical questions based on user specifications.
-
-            {delimiter}
-            Context:
-            You will receive three key inputs:
-            1. Subject(`{subject}`) (One of: OS, CN, OOPS, DBMS)
-            2. Difficulty Level(`{difficulty}`)(Easy, Medium, Hard)
-            3. Topic(`{topic}`): Specific topics within the subject. This is an optional input. If the user inputs "NA","Na" OR "na" simply mix all the topics and create the questions. You can refer to all the available topic in `{topics_and_subtopics}`.
-            {delimiter}
-
-            {delimiter}
-            Question Distribution:
-            - Generate exactly 15 questions total
-            - Include exactly 6 numerical problem-solving questions per subject
-            - Ensure even distribution across specified topics when multiple topics are provided
-            {delimiter}
-
-            {delimiter}
-            Question Quality Requirements:
-            1. Technical Accuracy:
-            - Generate only factually correct questions based on established CS principles
-            - Avoid any hallucinations or speculative content
-            - Include only industry-standard, verified information
-
-            2. Conceptual Testing:
-            - Focus on testing deep understanding rather than memorization
-            - Include questions that require problem-solving skills
-            - Test application of concepts in practical scenarios
-            - Incorporate questions that connect multiple related concepts
-
-            3. Option Design Requirements:
-            - Include plausible distractors that represent common misconceptions
-            - Vary the length of correct answers (avoid making the longest option always correct)
-            - Strategically include "All of the above" or "None of the above" options
-            - Distribute correct answers evenly among A, B, C, and D (avoid answer bias)
-            - Ensure options are mutually exclusive and collectively exhaustive
-
-            4. Bias Prevention:
-            - Use neutral language
-            - Avoid culture-specific references
-            - Ensure questions are accessible to all skill levels within the specified difficulty
-            - Remove any gender, age, or geographic biases
-            - Use inclusive technical scenarios
-            {delimiter}
-
-            {delimiter}
-            Difficulty Calibration:
-            1. Easy:
-            - Basic concept application
-            - Single-step problem solving
-            - Direct recall and understanding
-
-            2. Medium:
-            - Multi-step problem solving
-            - Concept integration
-            - Practical application scenarios
-
-            3. Hard:
-            - Complex problem analysis
-            - Multiple concept integration
-            - Advanced application scenarios
-            - Edge case considerations
-            {delimiter}
-
-            {delimiter}
-            Output Format:
-            Strictly adhere to this JSON format:
-            {{
-              "questions": [
-                {{
-                  "id": number,
-                  "subject": "string",
-                  "topic": "string",
-                  "difficulty": "string",
-                  "question_type": "multiple_choice",
-                  "question_text": "string",
-                  "options": [
-                    {{"key": "A", "text": "string"}},
-                    {{"key": "B", "text": "string"}},
-                    {{"key": "C", "text": "string"}},
-                    {{"key": "D", "text": "string"}}
-                  ],
-                  "correct_answer": "string",
-                  "explanation": "string",
-                  "status": "original"
-                }}
-              ]
-            }}
-            {delimiter}
-
-            {delimiter}
-            IMPORTANT:
-            - Return exactly 15 questions in the specified JSON format.
-            - Do not include any additional text or explanations.
-            - Ensure the JSON is valid and properly formatted.
-            {delimiter}
-            """
-
-            response = client.models.generate_content(
+            prompt = build_mcq_prompt(subject, difficulty, topic, topic_reference)
+
+            response = await llm_gateway.generate_content(
                 model=model, # Use the same model as before
                 contents=prompt,
                 config={
                     "response_mime_type": "application/json",
                     "response_schema": MCQResponse, 
-                    "temperature": 0.0, 
+                    "temperature": temperature,
                 }
                 
             )
@@ -236,7 +523,8 @@ def generate_mcqs_with_ai(subject, difficulty, topic, topics_and_subtopics):
             if not mcq_response or len(mcq_response.questions) != 15:
                 print(f"Expected 15 questions, but got {len(mcq_response.questions if mcq_response else [])}")
                 retry_count += 1
-                time.sleep(1)
+                metrics.retries.inc(feature="mcq", stage="generate")
+                await asyncio.sleep(1)
                 continue
 
             return mcq_response # Return the Pydantic object directly
@@ -246,11 +534,84 @@ def generate_mcqs_with_ai(subject, difficulty, topic, topics_and_subtopics):
         except Exception as e:
             print(f"Error during Gemini call: {e}")
             retry_count += 1
-            time.sleep(1)
+            metrics.retries.inc(feature="mcq", stage="generate")
+            await asyncio.sleep(1)
             continue
 
     raise HTTPException(status_code=500, detail="Failed to generate 15 questions after multiple retries")
 
+def plan_shards(subject, topic, total=15, shard_size=MCQ_SHARD_SIZE):
+    """Split a request into (topic, count) shards."""
+    counts = [shard_size] * (total // shard_size)
+    if total % shard_size:
+        counts.append(total % shard_size)
+
+    shard_topics = [topic] * len(counts)
+    if MCQ_SHARD_BY == "topic" and (topic or "NA").strip().lower() == "na":
+        subtopics = topic_catalogue.topics(subject)
+        if subtopics:
+            # Spread the shards evenly over the subject's topic list
+            step = len(subtopics) / len(counts)
+            shard_topics = [subtopics[int(i * step)] for i in range(len(counts))]
+    return list(zip(shard_topics, counts))
+
+async def generate_shard(subject, difficulty, topic, topic_reference, count, exclude=None, temperature=0.0):
+    """Generate one shard, retrying only this shard with exponential backoff."""
+    for attempt in range(MCQ_SHARD_MAX_RETRIES):
+        try:
+            prompt = build_mcq_prompt(subject, difficulty, topic, topic_reference,
+                                      count=count, exclude=exclude)
+            response = await llm_gateway.generate_content(
+                model=model,
+                contents=prompt,
+                config={
+                    "response_mime_type": "application/json",
+                    "response_schema": MCQResponse,
+                    "temperature": temperature,
+                }
+            )
+            mcq_response: MCQResponse = response.parsed
+            if mcq_response and mcq_response.questions:
+                return mcq_response.questions[:count]
+            print(f"Shard ({topic}, {count}) returned no questions")
+        except Exception as e:
+            print(f"Error during Gemini shard call ({topic}, {count}): {e}")
+        metrics.retries.inc(feature="mcq", stage="shard")
+        await asyncio.sleep(0.5 * 2 ** attempt)
+    return []
+
+def merge_shards(shards, total=15):
+    """Concatenate shard results, drop near-identical questions and renumber ids."""
+    merged = []
+    for questions in shards:
+        for question in questions:
+            if any(is_near_duplicate(question.question_text, kept.question_text) for kept in merged):
+                continue
+            merged.append(question)
+    merged = merged[:total]
+    for i, question in enumerate(merged, start=1):
+        question.id = i
+    return merged
+
+async def generate_mcqs_sharded(subject, difficulty, topic, topic_reference, total=15, temperature=0.0):
+    shards = plan_shards(subject, topic, total)
+    results = await asyncio.gather(*[
+        generate_shard(subject, difficulty, shard_topic, topic_reference, count, temperature=temperature)
+        for shard_topic, count in shards
+    ])
+    questions = merge_shards(results, total)
+
+    # Fill whatever failed shards or deduplication left missing with one more request
+    if len(questions) < total:
+        extra = await generate_shard(
+            subject, difficulty, topic, topic_reference, total - len(questions),
+            exclude=[question.question_text for question in questions], temperature=temperature)
+        questions = merge_shards([questions, extra], total)
+
+    if len(questions) < total:
+        raise HTTPException(status_code=500, detail=f"Failed to generate {total} questions after multiple retries")
+    return MCQResponse(questions=questions)
+
 if __name__ == '__main__':
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import random
+import re
+import sqlite3
+import threading
+from typing import List, Optional
+
+ANSWER_KEYS = ("A", "B", "C", "D")
+
+
+def normalize_question_text(text: str) -> str:
+    text = re.sub(r"[^a-z0-9 ]+", " ", (text or "").lower())
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def question_fingerprint(text: str) -> str:
+    return hashlib.sha1(normalize_question_text(text).encode("utf-8")).hexdigest()
+
+
+def is_near_duplicate(text: str, other: str, threshold: float = 0.85) -> bool:
+    """Token-set Jaccard similarity on normalised text, catching reworded repeats."""
+    tokens, other_tokens = set(normalize_question_text(text).split()), set(normalize_question_text(other).split())
+    if not tokens or not other_tokens:
+        return tokens == other_tokens
+    return len(tokens & other_tokens) / len(tokens | other_tokens) >= threshold
+
+
+def bucket_key(subject: str, topic: str, difficulty: str) -> str:
+    topic = (topic or "NA").strip()
+    if topic.lower() == "na":
+        topic = "NA"
+    return "|".join([(subject or "").strip().upper(), topic.lower(), (difficulty or "").strip().capitalize()])
+
+
+def answer_key(question: dict) -> Optional[str]:
+    """Resolve the correct answer to an option key, whether the model gave the key or the option text."""
+    answer = str(question.get("correct_answer", "")).strip()
+    if answer.upper().rstrip(".)") in ANSWER_KEYS:
+        return answer.upper().rstrip(".)")
+    for option in question.get("options", []):
+        if option.get("text", "").strip().lower() == answer.lower():
+            return str(option.get("key", "")).upper() or None
+    return None
+
+
+def load_seed_buckets(catalogue, include_topics: bool = False,
+                      difficulties=("Easy", "Medium", "Hard")) -> List[tuple]:
+    """
+    Build the (subject, topic, difficulty) buckets the warm-up worker should fill
+    from the topic catalogue. Mixed-topic ("NA") buckets come first since that is
+    what most students ask for.
+    """
+    mixed, specific = [], []
+    for subject in catalogue.subjects:
+        for difficulty in difficulties:
+            mixed.append((subject, "NA", difficulty))
+        for topic in catalogue.topics(subject):
+            for difficulty in difficulties:
+                specific.append((subject, topic, difficulty))
+    return mixed + specific if include_topics else mixed
+
+
+class QuestionBank:
+    """
+    Local store of pre-generated questions, bucketed by subject/topic/difficulty
+    and deduplicated by normalised question text.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS questions (
+                bucket TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                answer_key TEXT,
+                payload TEXT NOT NULL,
+                PRIMARY KEY (bucket, fingerprint)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def add(self, subject: str, topic: str, difficulty: str, questions: List[dict]) -> int:
+        """Insert questions into the bucket, skipping duplicates. Returns the number added."""
+        bucket = bucket_key(subject, topic, difficulty)
+        added = 0
+        with self._lock:
+            for question in questions:
+                key = answer_key(question)
+                if key is None:
+                    continue
+                question = dict(question, correct_answer=key)
+                cur = self._conn.execute(
+                    "INSERT OR IGNORE INTO questions (bucket, fingerprint, answer_key, payload) "
+                    "VALUES (?, ?, ?, ?)",
+                    (bucket, question_fingerprint(question.get("question_text", "")), key,
+                     json.dumps(question)))
+                added += cur.rowcount
+            self._conn.commit()
+        return added
+
+    def count(self, subject: str, topic: str, difficulty: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM questions WHERE bucket = ?",
+                (bucket_key(subject, topic, difficulty),)).fetchone()[0]
+
+    def sample(self, subject: str, topic: str, difficulty: str, n: int = 15) -> Optional[List[dict]]:
+        """
+        Draw `n` questions with correct answers spread as evenly as possible over A-D.
+        Returns None if the bucket does not hold enough questions yet.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT answer_key, payload FROM questions WHERE bucket = ?",
+                (bucket_key(subject, topic, difficulty),)).fetchall()
+        if len(rows) < n:
+            return None
+
+        pools = {key: [] for key in ANSWER_KEYS}
+        for key, payload in rows:
+            pools.setdefault(key, []).append(payload)
+        for pool in pools.values():
+            random.shuffle(pool)
+
+        # 15 over 4 keys -> three keys get 4 answers, one gets 3
+        keys = list(ANSWER_KEYS)
+        random.shuffle(keys)
+        quotas = {key: n // len(keys) + (1 if i < n % len(keys) else 0) for i, key in enumerate(keys)}
+
+        picked = []
+        for key in keys:
+            picked += pools[key][:quotas[key]]
+            del pools[key][:quotas[key]]
+        leftovers = [payload for pool in pools.values() for payload in pool]
+        random.shuffle(leftovers)
+        picked += leftovers[:n - len(picked)]
+
+        random.shuffle(picked)
+        questions = []
+        for i, payload in enumerate(picked, start=1):
+            question = json.loads(payload)
+            question["id"] = i
+            questions.append(question)
+        return questions
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT bucket, COUNT(*) FROM questions GROUP BY bucket").fetchall()
+        return {
+            "buckets": len(rows),
+            "questions": sum(count for _, count in rows),
+            "per_bucket": {bucket: count for bucket, count in rows},
+        }
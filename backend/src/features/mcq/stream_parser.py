@@ -0,0 +1,57 @@
+import json
+from typing import List
+
+
+class QuestionStreamParser:
+    """
+    Incrementally pull complete question objects out of a streamed
+    `{"questions": [{...}, {...}]}` JSON document.
+
+    Feed it text chunks as they arrive; every object that closes directly
+    inside the questions array is decoded and returned straight away.
+    """
+
+    def __init__(self):
+        self._buffer = []
+        self._stack = []
+        self._in_string = False
+        self._escaped = False
+        self._capturing = False
+
+    def _at_question_level(self) -> bool:
+        # Either {"questions": [ ... ]} or a bare top-level array
+        return self._stack == ["{", "["] or self._stack == ["["]
+
+    def feed(self, text: str) -> List[dict]:
+        completed = []
+        for char in text:
+            if self._capturing:
+                self._buffer.append(char)
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" and not self._capturing and self._at_question_level():
+                    self._capturing = True
+                    self._buffer = [char]
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack:
+                    self._stack.pop()
+                if char == "}" and self._capturing and self._at_question_level():
+                    self._capturing = False
+                    try:
+                        completed.append(json.loads("".join(self._buffer)))
+                    except json.JSONDecodeError:
+                        pass
+                    self._buffer = []
+        return completed
@@ -0,0 +1,135 @@
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+DIFFICULTIES = ("Easy", "Medium", "Hard")
+
+# Subject codes sent by the clients, keyed by the other names the data files use
+SUBJECT_CODES = {
+    "Operating Systems": "OS",
+    "Computer Networks": "CN",
+    "Database Management Systems": "DBMS",
+    "Object-Oriented Programming Systems": "OOPS",
+    "OOP": "OOPS",
+}
+
+
+def subject_code(name: str) -> str:
+    name = (name or "").strip()
+    if name in SUBJECT_CODES:
+        return SUBJECT_CODES[name]
+    if name.isupper():
+        return name
+    return "".join(word[0] for word in re.split(r"[\s\-]+", name) if word).upper()
+
+
+class TopicCatalogue:
+    """
+    In-memory view of topics_and_subtopics.json (plus the topic names from
+    overview.json), reloaded when the file's mtime changes.
+
+    Subjects are addressed by the codes clients send (OS, CN, DBMS, OOPS).
+    """
+
+    def __init__(self, topics_path: str, overview_path: Optional[str] = None,
+                 reload_interval: float = 2.0):
+        self.topics_path = topics_path
+        self.overview_path = overview_path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtimes = None
+        self._checked_at = 0.0
+        self._data: dict = {}
+        self._aliases: Dict[str, str] = {}
+        self._topics: Dict[str, List[str]] = {}
+        self._topic_index: Dict[str, Dict[str, str]] = {}
+        self._fragments: Dict[str, str] = {}
+
+    def _file_mtimes(self):
+        return tuple(os.path.getmtime(path) if path and os.path.exists(path) else None
+                     for path in (self.topics_path, self.overview_path))
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._mtimes is not None and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            mtimes = self._file_mtimes()
+            if mtimes != self._mtimes:
+                self._load()
+                self._mtimes = mtimes
+
+    def _load(self):
+        data, aliases, topics = {}, {}, {}
+        if os.path.exists(self.topics_path):
+            with open(self.topics_path, "r") as file:
+                data = json.load(file)
+            for name, subject_topics in data.items():
+                code = subject_code(name)
+                aliases[name.upper()] = aliases[code] = code
+                topics.setdefault(code, []).extend(subject_topics)
+
+        if self.overview_path and os.path.exists(self.overview_path):
+            with open(self.overview_path, "r") as file:
+                overview = json.load(file)
+            for subject in overview.get("subjects", []):
+                code = subject_code(subject["name"])
+                aliases[subject["name"].upper()] = aliases[code] = code
+                topics.setdefault(code, []).extend(topic["name"] for topic in subject.get("topics", []))
+
+        topic_index, fragments = {}, {}
+        for code, subject_topics in topics.items():
+            index = {}
+            for topic in subject_topics:
+                index.setdefault(topic.strip().lower(), topic)
+            topic_index[code] = index
+            topics[code] = list(index.values())
+            fragments[code] = f"{code} topics: " + "; ".join(topics[code])
+
+        self._data, self._aliases, self._topics = data, aliases, topics
+        self._topic_index, self._fragments = topic_index, fragments
+
+    @property
+    def data(self) -> dict:
+        """Raw contents of topics_and_subtopics.json, for the template dropdowns."""
+        self._refresh()
+        return self._data
+
+    @property
+    def subjects(self) -> List[str]:
+        self._refresh()
+        return list(self._topics)
+
+    def topics(self, subject: str) -> List[str]:
+        self._refresh()
+        return self._topics.get(self._aliases.get((subject or "").strip().upper(), ""), [])
+
+    def prompt_fragment(self, subject: str) -> str:
+        self._refresh()
+        return self._fragments.get(self._aliases.get((subject or "").strip().upper(), ""), "")
+
+    def resolve(self, subject: str, difficulty: str, topic: Optional[str]) -> Tuple[str, str, str]:
+        """
+        Normalise and validate a request's inputs, returning (subject code,
+        difficulty, topic). Raises ValueError with a user-facing message.
+        """
+        self._refresh()
+        code = self._aliases.get((subject or "").strip().upper())
+        if code is None:
+            raise ValueError(f"Unknown subject '{subject}'. Choose one of: {', '.join(self._topics)}")
+
+        normalized_difficulty = (difficulty or "").strip().capitalize()
+        if normalized_difficulty not in DIFFICULTIES:
+            raise ValueError(f"Unknown difficulty '{difficulty}'. Choose one of: {', '.join(DIFFICULTIES)}")
+
+        topic = (topic or "NA").strip()
+        if topic.lower() == "na":
+            return code, normalized_difficulty, "NA"
+        canonical_topic = self._topic_index[code].get(topic.lower())
+        if canonical_topic is None:
+            raise ValueError(f"Unknown topic '{topic}' for subject {code}")
+        return code, normalized_difficulty, canonical_topic
@@ -1,20 +1,30 @@
 import os
+import asyncio
+import hashlib
 import logging
+import shutil
+import tempfile
 import yaml
-import fitz  # PyMuPDF
-import pandas as pd
-import re
 import json
 import nltk
-from google import genai
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, List
 from google.genai import types
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field # Import Field for better type hinting if needed
 
+from common import llm_gateway, metrics
+from common.disk_cache import DiskCache, make_cache_key
+from common.process_pool import PoolBusyError, get_pool
+
+from .cohort import batch_format, stream_cohort_report
+from .company_catalogue import CompanyCatalogue
+from .eligibility import EligibilityEngine, check_eligibility, check_skills_match
+from .pdf_text import extract_pdf_text
+
 # Load environment variables
 load_dotenv()
 
@@ -41,7 +51,7 @@ try:
 except LookupError:
     nltk.download('stopwords')
 
-# Configure Gemini API client
+# Gemini calls go through the shared async gateway (common/llm_gateway.py)
 
 
 # def configure_gemini_api() -> genai.Client:
@@ -49,7 +59,6 @@ except LookupError:
 #     if not api_key:
 #         raise ValueError("Missing Gemini API key. Please set the GEMINI_API_KEY environment variable.")
 #     return genai.Client(api_key=api_key)
-gemini_client = genai.Client(api_key=os.getenv('Test_API_KEY'))  # Use the environment variable for the API key
 # FastAPI App Setup
 app = FastAPI(title="Resume Analyzer",
               description="API for analyzing resumes and checking company eligibility")
@@ -89,14 +98,43 @@ class EligibilityRequest(BaseModel):
     branch: str
     skills: List[str] # This model is for request, not for the AI's output
 
+# Pydantic model for checking one candidate against every company
+class CandidateProfile(BaseModel):
+    # NaN would compare False against every cutoff and pass them all
+    cgpa: float = Field(ge=0, le=10, allow_inf_nan=False)
+    hsc: float = Field(ge=0, le=100, allow_inf_nan=False)
+    ssc: float = Field(ge=0, le=100, allow_inf_nan=False)
+    branch: Optional[str] = None
+    skills: List[str] = Field(default_factory=list)
+    include_ineligible: bool = False
+    limit: Optional[int] = Field(default=None, ge=1)
+
 # Load company data
 COMPANY_DATA_FILE = os.path.join(
     "src", "features", "resume_analyzer", "company_data.csv")
 
+# Parsed and indexed once; edits to the CSV are picked up without a restart
+company_catalogue = CompanyCatalogue(COMPANY_DATA_FILE)
+eligibility_engine = EligibilityEngine(company_catalogue)
+
 UPLOAD_FOLDER = os.path.join(
     "src", "features", "resume_analyzer", "uploads")
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+# Students re-upload the same resume for every company they check; the parse is keyed by
+# the PDF's SHA-256 and the model, so only the first upload pays for extraction and Gemini
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", os.path.join(script_dir, "cache", "resume_parse.sqlite3"))
+resume_cache = DiskCache(
+    RESUME_CACHE_PATH,
+    ttl_seconds=float(os.getenv("RESUME_CACHE_TTL_SECONDS", 30 * 24 * 3600)),
+    max_entries=int(os.getenv("RESUME_CACHE_MAX_ENTRIES", 5000)),
+    max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", 128 * 1024 * 1024)),
+)
+metrics.register_cache("resume_parse", resume_cache.stats)
+
+# PyMuPDF parsing is CPU-bound; RESUME_PDF_POOL_MODE=process moves it off the server's GIL
+pdf_pool = get_pool("resume_pdf", workers=2, max_queue=16)
+
 CONFIG = os.path.join(
     "src", "features", "resume_analyzer", "config.yaml")
 
@@ -113,33 +151,17 @@ def load_config(config_path: str = CONFIG) -> dict:
         return {"MODEL": "gemini-1.5-pro"}
 
 
-def load_company_data(csv_path: str = COMPANY_DATA_FILE) -> pd.DataFrame:
-    current_directory = os.getcwd()
-    print("Current Working Directory:", current_directory)
-    try:
-        return pd.read_csv(csv_path)
-    except FileNotFoundError:
-        logger.error(f"Company data file not found: {csv_path}")
-        return pd.DataFrame(columns=["Company Name", "Skills Required", "CGPA", "HSC", "SSC", "Branch"])
-    except Exception as e:
-        logger.error(f"Error loading company data from {csv_path}: {e}")
-        return pd.DataFrame(columns=["Company Name", "Skills Required", "CGPA", "HSC", "SSC", "Branch"])
+def parse_model() -> str:
+    return os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
 
 
-def extract_pdf_text(file_path: str) -> str:
-    try:
-        doc = fitz.open(file_path)
-        text = " ".join(page.get_text() for page in doc)
-        doc.close()
-        return text
-    except Exception as e:
-        logger.error(f"PDF extraction error for {file_path}: {e}")
-        return ""
+def resume_cache_key(content: bytes, model_name: str) -> str:
+    return make_cache_key("resume-parse", model_name, hashlib.sha256(content).hexdigest())
 
 
-def parse_resume(text: str, client: genai.Client) -> ResumeAnalysisResponse:
+async def parse_resume(text: str) -> ResumeAnalysisResponse:
     try:
-        model_name = os.getenv("GEMINI_MODEL", "gemini-2.0-flash") 
+        model_name = parse_model()
 
         prompt = f"""
         Analyze this resume text and extract the following information:
@@ -153,7 +175,7 @@ def parse_resume(text: str, client: genai.Client) -> ResumeAnalysisResponse:
         {text}
         """
         # The response_schema will guide the model to output the correct structure
-        response = client.models.generate_content(
+        response = await llm_gateway.generate_content(
             model=model_name,
             contents=prompt,
             config=types.GenerateContentConfig(temperature=0.3,response_mime_type="application/json",response_schema=ResumeAnalysisResponse)
@@ -176,51 +198,10 @@ def parse_resume(text: str, client: genai.Client) -> ResumeAnalysisResponse:
         return ResumeAnalysisResponse()
 
 
-# Check missing skills against required ones
-def check_skills_match(candidate_skills: List[str], required_skills: str) -> List[str]:
-    if not required_skills or pd.isna(required_skills):
-        return []
-    required_skills_list = [skill.strip().lower()
-                            for skill in required_skills.split(',')]
-    candidate_skills_lower = [skill.lower() for skill in candidate_skills]
-    return [skill for skill in required_skills_list if skill not in candidate_skills_lower]
-
-# Check eligibility based on academic criteria
-def check_eligibility(company_row, cgpa, hsc, ssc, branch):
-    eligible = True
-    reasons = []
-
-    # Check CGPA
-    if 'CGPA' in company_row and pd.notna(company_row['CGPA']) and float(company_row['CGPA']) > 0:
-        if float(cgpa) < float(company_row['CGPA']):
-            eligible = False
-            reasons.append(
-                f"CGPA requirement not met: {cgpa} < {company_row['CGPA']}")
-
-    # Check HSC
-    if 'HSC' in company_row and pd.notna(company_row['HSC']) and float(company_row['HSC']) > 0:
-        if float(hsc) < float(company_row['HSC']):
-            eligible = False
-            reasons.append(
-                f"12th percentage requirement not met: {hsc} < {company_row['HSC']}")
-
-    # Check SSC
-    if 'SSC' in company_row and pd.notna(company_row['SSC']) and float(company_row['SSC']) > 0:
-        if float(ssc) < float(company_row['SSC']):
-            eligible = False
-            reasons.append(
-                f"10th percentage requirement not met: {ssc} < {company_row['SSC']}")
-
-    # Check Branch
-    if 'Branch' in company_row and pd.notna(company_row['Branch']) and company_row['Branch']:
-        eligible_branches = [b.strip()
-                             for b in str(company_row['Branch']).split(',')]
-        if branch and branch not in eligible_branches and eligible_branches != ['']:
-            eligible = False
-            reasons.append(
-                f"Branch {branch} not in eligible branches: {', '.join(eligible_branches)}")
-
-    return eligible, reasons
+@app.on_event("startup")
+async def load_companies():
+    # Parse the company list (and build its eligibility matrix) before the first request
+    eligibility_engine.matrix
 
 
 # @app.on_event("startup")
@@ -243,51 +224,57 @@ async def analyze_resume(
     ssc: Optional[float] = Form(None),
     branch: Optional[str] = Form(None)
 ):
-    if not gemini_client:
-        raise HTTPException(status_code=500, detail="Gemini API not initialized.")
-
     file_path = None # Initialize file_path
     try:
-        # Save uploaded file
-        file_path = os.path.join(UPLOAD_FOLDER, resume.filename)
-        with open(file_path, "wb") as f:
-            f.write(await resume.read())
-
-        # Extract text from PDF
-        cv_text = extract_pdf_text(file_path)
-        if not cv_text:
-            raise HTTPException(
-                status_code=400,
-                detail="Failed to extract text from resume. Please ensure it's a valid PDF."
-            )
-
-        # Load configuration
-        
+        content = await resume.read()
+
+        # The same PDF parsed by the same model is served from the cache: no extraction, no LLM call
+        cache_key = resume_cache_key(content, parse_model())
+        cached = await asyncio.to_thread(resume_cache.get, cache_key)
+        if cached is not None:
+            extracted_data = ResumeAnalysisResponse.model_validate(json.loads(cached)["analysis"])
+        else:
+            # Save uploaded file
+            file_path = os.path.join(UPLOAD_FOLDER, resume.filename)
+            with open(file_path, "wb") as f:
+                f.write(content)
+
+            # Extract text from PDF in the parsing pool; shed load with 503 when it is full
+            try:
+                cv_text = await pdf_pool.run(extract_pdf_text, file_path)
+            except PoolBusyError:
+                raise HTTPException(status_code=503, detail="Resume parsing is busy, please retry shortly.",
+                                    headers={"Retry-After": "2"})
+            finally:
+                os.unlink(file_path)
+                file_path = None
+            if not cv_text:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Failed to extract text from resume. Please ensure it's a valid PDF."
+                )
 
-        # Parse resume using Gemini and get a Pydantic object
-        extracted_data: ResumeAnalysisResponse = parse_resume(cv_text, gemini_client)
+            # Parse resume using Gemini and get a Pydantic object
+            extracted_data: ResumeAnalysisResponse = await parse_resume(cv_text)
+            # parse_resume answers failures with an empty result, which must not be cached
+            if extracted_data != ResumeAnalysisResponse():
+                await asyncio.to_thread(resume_cache.set, cache_key, json.dumps(
+                    {"text": cv_text, "analysis": extracted_data.model_dump()}))
         
         # Prepare base response data using the Pydantic object's attributes
         response_data = extracted_data.model_dump() # Convert Pydantic object to dict
 
         # If company is provided, check eligibility
         if company and cgpa is not None and hsc is not None and ssc is not None and branch:
-            # Load company data
-            df = load_company_data()
-
-            # Check if company exists
-            company_row = df[df["Company Name"] == company]
-            if not company_row.empty:
-                company_data = company_row.iloc[0].to_dict()
-
+            company_data = company_catalogue.get(company)
+            if company_data is not None:
                 # Check missing skills - now access from extracted_data.skills
                 all_candidate_skills = (
                     extracted_data.skills.technical +
                     extracted_data.skills.soft_skills +
                     extracted_data.skills.domain_knowledge
                 )
-                required_skills = company_data.get("Skills Required", "")
-                missing_skills = check_skills_match(all_candidate_skills, required_skills)
+                missing_skills = check_skills_match(all_candidate_skills, company_data)
 
                 # Check eligibility based on academic criteria
                 eligible, reasons = check_eligibility(
@@ -306,8 +293,6 @@ async def analyze_resume(
                     "reasons": ["Company not found in our database."]
                 })
         
-        # Clean up file
-        os.unlink(file_path)
         print(response_data)
 
         return response_data # FastAPI will serialize this dictionary to JSON based on response_model
@@ -327,60 +312,82 @@ async def analyze_resume(
 
 @app.get("/companies")
 async def get_companies():
-    try:
-        df = load_company_data()
-        companies = df["Company Name"].tolist()
-        return JSONResponse(content={"success": True, "companies": companies})
-    except Exception as e:
-        logger.error(f"Get companies error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to retrieve companies: {str(e)}"
-        )
+    return JSONResponse(content={"success": True, "companies": company_catalogue.names})
 
 
 @app.get("/company/{company_name}")
 async def get_company_requirements(company_name: str):
-    try:
-        df = load_company_data()
-        company_row = df[df["Company Name"] == company_name]
-        if company_row.empty:
-            raise HTTPException(
-                status_code=404,
-                detail="Company not found"
-            )
-
-        company_data = company_row.iloc[0].to_dict()
-
-        skills_required = []
-        if "Skills Required" in company_data and pd.notna(company_data["Skills Required"]):
-            skills_required = [
-                skill.strip() for skill in company_data["Skills Required"].split(',')]
-
-        eligible_branches = []
-        if "Branch" in company_data and pd.notna(company_data["Branch"]):
-            eligible_branches = [branch.strip() for branch in str(
-                company_data["Branch"]).split(',')]
-
-        requirements = {
-            "company_name": company_name,
-            "skills_required": skills_required,
-            "cgpa": company_data.get("CGPA", 0) if pd.notna(company_data.get("CGPA", 0)) else 0,
-            "hsc": company_data.get("HSC", 0) if pd.notna(company_data.get("HSC", 0)) else 0,
-            "ssc": company_data.get("SSC", 0) if pd.notna(company_data.get("SSC", 0)) else 0,
-            "eligible_branches": eligible_branches
-        }
-
-        return JSONResponse(content={"success": True, "requirements": requirements})
-
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Get company requirements error: {e}")
+    company = company_catalogue.get(company_name)
+    if company is None:
         raise HTTPException(
-            status_code=500,
-            detail=f"Failed to retrieve company requirements: {str(e)}"
+            status_code=404,
+            detail="Company not found"
         )
+    return JSONResponse(content={"success": True, "requirements": company.requirements()})
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return resume_cache.stats()
+
+
+@app.post("/eligible_companies")
+def get_eligible_companies(candidate: CandidateProfile):
+    """
+    Every company the candidate is eligible for, best skill match first,
+    with the skills each one still needs. include_ineligible=true appends
+    the other companies with the reasons they were ruled out.
+    """
+    eligible_count, companies = eligibility_engine.rank(
+        candidate.cgpa, candidate.hsc, candidate.ssc, candidate.branch, candidate.skills,
+        include_ineligible=candidate.include_ineligible, limit=candidate.limit)
+    return {
+        "success": True,
+        "total_companies": len(eligibility_engine.matrix.companies),
+        "eligible_count": eligible_count,
+        "companies": companies,
+    }
+
+
+@app.post("/eligibility/batch")
+async def batch_eligibility(
+    file: UploadFile = File(...),
+    format: Optional[str] = Form(None),
+    output: Optional[str] = Form(None),
+    details: bool = Form(False)
+):
+    """
+    Cohort report for placement cells: upload a CSV or JSONL of candidates
+    (cgpa, hsc, ssc, branch, skills, optional student_id/name) and get one
+    line back per student as it is processed. output=csv (default for CSV
+    input) is a student x company Y/N matrix; output=jsonl lists eligible
+    companies with missing skills. No LLM calls are made.
+    """
+    try:
+        input_format = batch_format(file.filename, format)
+        output_format = batch_format("", output or input_format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The upload is closed when this handler returns, so copy it (in chunks) to a
+    # file the response can read from while it streams
+    spool = tempfile.NamedTemporaryFile(suffix=f".{input_format}", delete=False)
+    try:
+        await file.seek(0)
+        await run_in_threadpool(shutil.copyfileobj, file.file, spool)
+    finally:
+        spool.close()
+
+    def report():
+        try:
+            with open(spool.name, "r", encoding="utf-8-sig", newline="") as text:
+                yield from stream_cohort_report(eligibility_engine, text, input_format, output_format, details)
+        finally:
+            os.unlink(spool.name)
+
+    media_type = "text/csv" if output_format == "csv" else "application/x-ndjson"
+    return StreamingResponse(report(), media_type=media_type, headers={
+        "Content-Disposition": f'attachment; filename="eligibility_report.{output_format}"'})
 
 
 @app.get("/")
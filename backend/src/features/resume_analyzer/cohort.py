@@ -0,0 +1,189 @@
+import csv
+import io
+import json
+import math
+from typing import IO, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .eligibility import EligibilityEngine, check_eligibility
+
+BATCH_FORMATS = ("csv", "jsonl")
+
+# Accepted column names for each candidate field (matched case-insensitively)
+FIELD_ALIASES = {
+    "student_id": ("student_id", "id", "roll_no", "roll number", "prn", "email"),
+    "name": ("name", "student_name", "student name"),
+    "cgpa": ("cgpa",),
+    "hsc": ("hsc", "12th", "12th percentage"),
+    "ssc": ("ssc", "10th", "10th percentage"),
+    "branch": ("branch", "department"),
+    "skills": ("skills",),
+}
+
+
+def batch_format(filename: str, requested: Optional[str] = None) -> str:
+    """Input format from an explicit choice or the file extension (.csv, .jsonl/.ndjson)."""
+    if requested:
+        if requested.lower() not in BATCH_FORMATS:
+            raise ValueError(f"Unknown format '{requested}'. Choose one of: {', '.join(BATCH_FORMATS)}")
+        return requested.lower()
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    raise ValueError("Upload a .csv or .jsonl file, or pass format=csv|jsonl")
+
+
+def _field(record: dict, field: str):
+    lowered = {str(key).strip().lower(): value for key, value in record.items()}
+    for alias in FIELD_ALIASES[field]:
+        if alias in lowered and lowered[alias] not in (None, ""):
+            return lowered[alias]
+    return None
+
+
+def _skills(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return [str(skill).strip() for skill in value if str(skill).strip()]
+    # "Python; SQL" or "Python, SQL"
+    return [skill.strip() for skill in str(value).replace(";", ",").split(",") if skill.strip()]
+
+
+def student_label(record: Optional[dict], line: int) -> str:
+    """The record's student id, else its name, else the input line number."""
+    if record:
+        return str(_field(record, "student_id") or _field(record, "name") or f"row-{line}")
+    return f"row-{line}"
+
+
+def parse_candidate(record: dict, line: int) -> dict:
+    """Normalise one input record; raises ValueError with a per-row message."""
+    candidate = {
+        "student_id": student_label(record, line),
+        "branch": _field(record, "branch"),
+        "skills": _skills(_field(record, "skills")),
+    }
+    for score in ("cgpa", "hsc", "ssc"):
+        value = _field(record, score)
+        if value is None:
+            raise ValueError(f"{score} is missing (expected a column named {' or '.join(FIELD_ALIASES[score])})")
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{score} '{value}' is not a number")
+        # NaN compares False against every cutoff, so it would pass them all
+        if not math.isfinite(number):
+            raise ValueError(f"{score} '{value}' is not a finite number")
+        candidate[score] = number
+    return candidate
+
+
+def iter_records(text: IO[str], fmt: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (line number, record, error) one input row at a time."""
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record, None
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"invalid JSON: {e.msg}"
+            continue
+        if not isinstance(record, dict):
+            yield line_number, None, "expected a JSON object"
+            continue
+        yield line_number, record, None
+
+
+def company_labels(companies) -> List[str]:
+    """Unique matrix column names: repeated company names get the profile, then a row number, appended."""
+    counts = {}
+    for company in companies:
+        counts[company.name] = counts.get(company.name, 0) + 1
+    labels, seen = [], set()
+    for row, company in enumerate(companies, start=1):
+        label = company.name if counts[company.name] == 1 else f"{company.name} ({company.profile})"
+        if label in seen:
+            label = f"{label} #{row}"
+        seen.add(label)
+        labels.append(label)
+    return labels
+
+
+def stream_cohort_report(engine: EligibilityEngine, text: IO[str], fmt: str, output: str,
+                         details: bool = False) -> Iterator[str]:
+    """
+    Check each candidate in `text` against every company and yield the
+    report incrementally, one student per line.
+
+    output="csv" is a student x company matrix of Y/N cells plus an
+    eligible count; output="jsonl" gives each student's eligible companies
+    with missing skills (and with details=true, the reasons for the rest).
+    Rows that can't be parsed are reported with an error instead of
+    stopping the batch.
+    """
+    matrix = engine.matrix
+    labels = company_labels(matrix.companies)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def csv_line(row) -> str:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerow(row)
+        return buffer.getvalue()
+
+    if output == "csv":
+        yield csv_line(["student_id", "eligible_count", *labels, "error"])
+
+    for line, record, error in iter_records(text, fmt):
+        candidate = None
+        if error is None:
+            try:
+                candidate = parse_candidate(record, line)
+            except ValueError as e:
+                error = str(e)
+        if candidate is None:
+            student_id = student_label(record, line)
+            if output == "csv":
+                yield csv_line([student_id, "", *[""] * len(labels), error])
+            else:
+                yield json.dumps({"student_id": student_id, "line": line, "error": error}) + "\n"
+            continue
+
+        result = matrix.evaluate(candidate["cgpa"], candidate["hsc"], candidate["ssc"],
+                                 candidate["branch"], candidate["skills"])
+        eligible = result["eligible"]
+        if output == "csv":
+            cells = ["Y" if value else "N" for value in eligible.tolist()]
+            yield csv_line([candidate["student_id"], int(eligible.sum()), *cells, ""])
+            continue
+
+        row = {"student_id": candidate["student_id"], "eligible_count": int(eligible.sum()), "eligible": [
+            {
+                "company": labels[index],
+                "skill_match": round(float(result["coverage"][index]), 3),
+                "missing_skills": matrix.missing_skills(index, result["known"]),
+            }
+            for index in np.flatnonzero(eligible).tolist()
+        ]}
+        if details:
+            row["ineligible"] = [
+                {
+                    "company": labels[index],
+                    "reasons": check_eligibility(matrix.companies[index], candidate["cgpa"], candidate["hsc"],
+                                                 candidate["ssc"], candidate["branch"])[1],
+                }
+                for index in np.flatnonzero(~eligible).tolist()
+            ]
+        row["eligible"].sort(key=lambda item: -item["skill_match"])
+        yield json.dumps(row) + "\n"
@@ -0,0 +1,138 @@
+import logging
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from common.skills import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ["Company Name", "Profile", "CGPA", "HSC", "SSC", "Branch", "Skills Required"]
+
+
+def normalize_name(name: str) -> str:
+    """Lookup key for a company name: case-insensitive, whitespace-collapsed."""
+    return re.sub(r"\s+", " ", (name or "").strip()).casefold()
+
+
+def normalize_branch(branch: str) -> str:
+    return (branch or "").strip().upper()
+
+
+def _split(value: str) -> List[str]:
+    return [part.strip() for part in (value or "").split(",") if part.strip()]
+
+
+def _cutoff(value: str) -> float:
+    """Minimum score from a CSV cell; 0 (no requirement) when empty or not a number."""
+    try:
+        cutoff = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return cutoff if cutoff > 0 else 0.0
+
+
+class Company:
+    """One row of company_data.csv, parsed once when the catalogue loads."""
+
+    def __init__(self, row: dict):
+        self.name = (row.get("Company Name") or "").strip()
+        self.profile = (row.get("Profile") or "").strip()
+        self.cgpa = _cutoff(row.get("CGPA"))
+        self.hsc = _cutoff(row.get("HSC"))
+        self.ssc = _cutoff(row.get("SSC"))
+        self.branches = _split(row.get("Branch"))
+        self.branch_set = frozenset(normalize_branch(branch) for branch in self.branches)
+        self.skills = _split(row.get("Skills Required"))
+        # Canonical skill ids ("JS" and "JavaScript" are one requirement), de-duplicated in
+        # order, and the lowercased spelling each missing skill is reported as
+        taxonomy = get_taxonomy()
+        labels = {}
+        for skill in self.skills:
+            labels.setdefault(taxonomy.canonical(skill), skill.lower())
+        self.skill_keys = list(labels)
+        self.skill_labels = list(labels.values())
+
+    def requirements(self) -> dict:
+        return {
+            "company_name": self.name,
+            "skills_required": self.skills,
+            "cgpa": self.cgpa,
+            "hsc": self.hsc,
+            "ssc": self.ssc,
+            "eligible_branches": self.branches,
+        }
+
+
+class CompanyCatalogue:
+    """
+    In-memory, indexed view of company_data.csv, reloaded when the file's
+    mtime changes (checked at most every `reload_interval` seconds).
+
+    Companies are looked up by normalized name; when a name appears on
+    several rows the first one is used, as before.
+    """
+
+    def __init__(self, csv_path: str, reload_interval: float = 2.0):
+        self.csv_path = csv_path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self._companies: List[Company] = []
+        self._index: Dict[str, Company] = {}
+        self._names: List[str] = []
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._mtime is not None and now - self._checked_at < self.reload_interval:
+            return
+        with self._lock:
+            self._checked_at = now
+            mtime = os.path.getmtime(self.csv_path) if os.path.exists(self.csv_path) else -1
+            if mtime != self._mtime:
+                self._load()
+                self._mtime = mtime
+
+    def _load(self):
+        if os.path.exists(self.csv_path):
+            # Strings throughout: cells are parsed once below, "NA" profiles stay as written
+            df = pd.read_csv(self.csv_path, dtype=str, keep_default_na=False)
+        else:
+            logger.warning(f"Company data file not found: {self.csv_path}")
+            df = pd.DataFrame(columns=COLUMNS)
+
+        companies, index = [], {}
+        for row in df.to_dict("records"):
+            company = Company(row)
+            if not company.name:
+                continue
+            companies.append(company)
+            index.setdefault(normalize_name(company.name), company)
+
+        self._companies, self._index = companies, index
+        self._names = [company.name for company in index.values()]
+        logger.info(f"Loaded {len(index)} companies from {self.csv_path}")
+
+    @property
+    def names(self) -> List[str]:
+        self._refresh()
+        return self._names
+
+    @property
+    def companies(self) -> List[Company]:
+        """Every row, in file order."""
+        self._refresh()
+        return self._companies
+
+    def get(self, name: str) -> Optional[Company]:
+        self._refresh()
+        return self._index.get(normalize_name(name))
+
+    def __len__(self) -> int:
+        self._refresh()
+        return len(self._index)
@@ -0,0 +1,163 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from common.skills import get_taxonomy
+
+from .company_catalogue import Company, CompanyCatalogue, normalize_branch
+
+
+def candidate_skill_keys(candidate_skills: List[str]) -> set:
+    # Canonical ids, including known skills named inside longer entries
+    return get_taxonomy().canonical_set(candidate_skills)
+
+
+# Check missing skills against required ones
+def check_skills_match(candidate_skills: List[str], company: Company) -> List[str]:
+    candidate_keys = candidate_skill_keys(candidate_skills)
+    return [label for key, label in zip(company.skill_keys, company.skill_labels) if key not in candidate_keys]
+
+
+# Check eligibility based on academic criteria
+def check_eligibility(company: Company, cgpa, hsc, ssc, branch):
+    eligible = True
+    reasons = []
+
+    # Cutoffs are pre-parsed by the catalogue; 0 means no requirement
+    if company.cgpa and float(cgpa) < company.cgpa:
+        eligible = False
+        reasons.append(
+            f"CGPA requirement not met: {cgpa} < {company.cgpa:g}")
+
+    if company.hsc and float(hsc) < company.hsc:
+        eligible = False
+        reasons.append(
+            f"12th percentage requirement not met: {hsc} < {company.hsc:g}")
+
+    if company.ssc and float(ssc) < company.ssc:
+        eligible = False
+        reasons.append(
+            f"10th percentage requirement not met: {ssc} < {company.ssc:g}")
+
+    if company.branch_set and branch and normalize_branch(branch) not in company.branch_set:
+        eligible = False
+        reasons.append(
+            f"Branch {branch} not in eligible branches: {', '.join(company.branches)}")
+
+    return eligible, reasons
+
+
+class CompanyMatrix:
+    """
+    Columnar form of the catalogue: cutoffs as float arrays, accepted
+    branches as one boolean column per branch, and required skills as a
+    CSR-style (company, skill id) list, so one candidate is checked against
+    every company with a handful of NumPy operations.
+    """
+
+    def __init__(self, companies: List[Company]):
+        self.companies = companies
+        count = len(companies)
+        self.cgpa = np.array([company.cgpa for company in companies], dtype=np.float64)
+        self.hsc = np.array([company.hsc for company in companies], dtype=np.float64)
+        self.ssc = np.array([company.ssc for company in companies], dtype=np.float64)
+
+        self.any_branch = np.array([not company.branch_set for company in companies], dtype=bool)
+        self.branch_columns: Dict[str, np.ndarray] = {}
+        for row, company in enumerate(companies):
+            for branch in company.branch_set:
+                self.branch_columns.setdefault(branch, np.zeros(count, dtype=bool))[row] = True
+
+        self.skill_ids: Dict[str, int] = {}
+        self.company_skill_ids: List[List[int]] = []
+        owners, ids = [], []
+        for row, company in enumerate(companies):
+            company_ids = [self.skill_ids.setdefault(skill, len(self.skill_ids)) for skill in company.skill_keys]
+            self.company_skill_ids.append(company_ids)
+            owners.extend([row] * len(company_ids))
+            ids.extend(company_ids)
+        self.skill_owner = np.array(owners, dtype=np.int64)
+        self.skill_index = np.array(ids, dtype=np.int64)
+        self.required_count = np.bincount(self.skill_owner, minlength=count)
+
+    def evaluate(self, cgpa: float, hsc: float, ssc: float, branch: Optional[str],
+                 candidate_skills: List[str]) -> dict:
+        """Failure masks and skill coverage for every company at once."""
+        count = len(self.companies)
+        cgpa_fail = (self.cgpa > 0) & (float(cgpa) < self.cgpa)
+        hsc_fail = (self.hsc > 0) & (float(hsc) < self.hsc)
+        ssc_fail = (self.ssc > 0) & (float(ssc) < self.ssc)
+        if branch:
+            accepted = self.branch_columns.get(normalize_branch(branch), np.zeros(count, dtype=bool))
+            branch_fail = ~(self.any_branch | accepted)
+        else:
+            branch_fail = np.zeros(count, dtype=bool)
+
+        known = {self.skill_ids[key] for key in candidate_skill_keys(candidate_skills) if key in self.skill_ids}
+        has_skill = np.zeros(len(self.skill_ids), dtype=bool)
+        has_skill[list(known)] = True
+        matched = np.bincount(self.skill_owner, weights=has_skill[self.skill_index], minlength=count)
+        coverage = np.divide(matched, self.required_count, out=np.ones(count), where=self.required_count > 0)
+
+        return {
+            "eligible": ~(cgpa_fail | hsc_fail | ssc_fail | branch_fail),
+            "coverage": coverage,
+            "known": known,
+        }
+
+    def missing_skills(self, row: int, known: set) -> List[str]:
+        return [label for label, skill_id in zip(self.companies[row].skill_labels, self.company_skill_ids[row])
+                if skill_id not in known]
+
+
+class EligibilityEngine:
+    """Ranks every company in the catalogue for one candidate; the matrix is rebuilt when the catalogue reloads."""
+
+    def __init__(self, catalogue: CompanyCatalogue):
+        self.catalogue = catalogue
+        self._lock = threading.Lock()
+        self._matrix: Optional[CompanyMatrix] = None
+
+    @property
+    def matrix(self) -> CompanyMatrix:
+        companies = self.catalogue.companies
+        matrix = self._matrix
+        if matrix is None or matrix.companies is not companies:
+            with self._lock:
+                if self._matrix is None or self._matrix.companies is not companies:
+                    self._matrix = CompanyMatrix(companies)
+                matrix = self._matrix
+        return matrix
+
+    def rank(self, cgpa: float, hsc: float, ssc: float, branch: Optional[str], skills: List[str],
+             include_ineligible: bool = False, limit: Optional[int] = None) -> Tuple[int, List[dict]]:
+        """
+        Returns (number of eligible companies, ranked results). Eligible
+        companies come first, ordered by the share of their required skills
+        the candidate has; each result lists missing skills and, for
+        ineligible companies, the reasons.
+        """
+        matrix = self.matrix
+        result = matrix.evaluate(cgpa, hsc, ssc, branch, skills)
+        eligible, coverage = result["eligible"], result["coverage"]
+
+        rows = np.arange(len(matrix.companies)) if include_ineligible else np.flatnonzero(eligible)
+        # Stable sort keeps file order among ties
+        order = rows[np.lexsort((-coverage[rows], ~eligible[rows]))]
+        if limit is not None:
+            order = order[:limit]
+
+        ranked = []
+        for row in order.tolist():
+            company = matrix.companies[row]
+            reasons = [] if eligible[row] else check_eligibility(company, cgpa, hsc, ssc, branch)[1]
+            ranked.append({
+                "company_name": company.name,
+                "profile": company.profile,
+                "eligible": bool(eligible[row]),
+                "skill_match": round(float(coverage[row]), 3),
+                "missing_skills": matrix.missing_skills(row, result["known"]),
+                "reasons": reasons,
+            })
+        return int(eligible.sum()), ranked
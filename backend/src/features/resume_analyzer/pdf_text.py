@@ -0,0 +1,17 @@
+import logging
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+
+def extract_pdf_text(file_path: str) -> str:
+    # Kept free of the app's imports so pool worker processes start quickly
+    try:
+        doc = fitz.open(file_path)
+        text = " ".join(page.get_text() for page in doc)
+        doc.close()
+        return text
+    except Exception as e:
+        logger.error(f"PDF extraction error for {file_path}: {e}")
+        return ""
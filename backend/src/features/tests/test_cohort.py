@@ -0,0 +1,37 @@
+import csv
+import io
+import json
+import os
+
+import pytest
+
+from resume_analyzer.cohort import parse_candidate, stream_cohort_report
+from resume_analyzer.company_catalogue import CompanyCatalogue
+from resume_analyzer.eligibility import EligibilityEngine
+
+COMPANY_DATA = os.path.join(os.path.dirname(__file__), "..", "resume_analyzer", "company_data.csv")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return EligibilityEngine(CompanyCatalogue(COMPANY_DATA))
+
+
+@pytest.mark.parametrize("cgpa", ["nan", "NaN", "inf", "-Infinity"])
+def test_non_finite_score_is_rejected(cgpa):
+    with pytest.raises(ValueError, match="cgpa"):
+        parse_candidate({"student_id": "S1", "cgpa": cgpa, "hsc": "80", "ssc": "80"}, 2)
+
+
+def test_non_finite_jsonl_score_gets_an_error_row(engine):
+    text = io.StringIO('{"student_id": "S1", "cgpa": NaN, "hsc": 80, "ssc": 80}\n')
+    rows = [json.loads(line) for line in stream_cohort_report(engine, text, "jsonl", "jsonl")]
+    assert rows == [{"student_id": "S1", "line": 1, "error": "cgpa 'nan' is not a finite number"}]
+
+
+def test_unrecognised_score_column_gets_an_error_row(engine):
+    text = io.StringIO("student_id,GPA,HSC %,SSC\nS1,8.5,85,90\n")
+    rows = list(csv.DictReader(stream_cohort_report(engine, text, "csv", "csv")))
+    assert len(rows) == 1
+    assert rows[0]["student_id"] == "S1" and rows[0]["eligible_count"] == ""
+    assert rows[0]["error"].startswith("cgpa is missing")
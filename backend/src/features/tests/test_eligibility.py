@@ -0,0 +1,45 @@
+import os
+import random
+
+import pytest
+from pydantic import ValidationError
+
+from resume_analyzer.app import CandidateProfile
+from resume_analyzer.company_catalogue import CompanyCatalogue
+from resume_analyzer.eligibility import EligibilityEngine, check_eligibility, check_skills_match
+
+COMPANY_DATA = os.path.join(os.path.dirname(__file__), "..", "resume_analyzer", "company_data.csv")
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return EligibilityEngine(CompanyCatalogue(COMPANY_DATA))
+
+
+def test_matrix_agrees_with_row_by_row_checks(engine):
+    rng = random.Random(0)
+    companies = engine.catalogue.companies
+    assert companies
+    branches = sorted({branch for company in companies for branch in company.branches}) + ["MECH", None]
+    skills = sorted({skill for company in companies for skill in company.skills})
+    for _ in range(200):
+        cgpa, hsc, ssc = round(rng.uniform(5, 10), 2), rng.randint(40, 100), rng.randint(40, 100)
+        branch = rng.choice(branches)
+        candidate = rng.sample(skills, min(len(skills), rng.randint(0, 12)))
+        result = engine.matrix.evaluate(cgpa, hsc, ssc, branch, candidate)
+        for row, company in enumerate(companies):
+            expected = (check_eligibility(company, cgpa, hsc, ssc, branch)[0],
+                        check_skills_match(candidate, company))
+            actual = (bool(result["eligible"][row]), engine.matrix.missing_skills(row, result["known"]))
+            assert actual == expected, (company.name, cgpa, hsc, ssc, branch, candidate)
+
+
+@pytest.mark.parametrize("scores", [
+    {"cgpa": float("nan"), "hsc": 80, "ssc": 80},
+    {"cgpa": 8, "hsc": float("inf"), "ssc": 80},
+    {"cgpa": 11, "hsc": 80, "ssc": 80},
+    {"cgpa": 8, "hsc": 80, "ssc": -1},
+])
+def test_profile_rejects_scores_outside_their_scale(scores):
+    with pytest.raises(ValidationError):
+        CandidateProfile(**scores)
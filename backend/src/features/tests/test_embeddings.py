@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("sentence_transformers")
+pytest.importorskip("transformers")
+
+from youtube_transcript.embeddings import (DEFAULT_MODEL, SAMPLE_TEXTS, OnnxBackend, SentenceTransformerBackend,
+                                           compare_backends)
+
+# A local sentence-transformers directory can stand in for the hub model when offline
+MODEL = os.getenv("EMBED_TEST_MODEL", DEFAULT_MODEL)
+# Minimum per-text cosine to the torch reference for each ONNX variant
+MIN_COSINE = {"onnx-fp32": 0.999, "onnx-int8": 0.98}
+
+
+@pytest.fixture(scope="module")
+def reference():
+    backend = SentenceTransformerBackend(MODEL)
+    try:
+        backend.encode(["warm up"])
+    except OSError as e:
+        pytest.skip(f"{MODEL} is not available: {e}")
+    return backend
+
+
+@pytest.fixture(scope="module")
+def model_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp("onnx"))
+
+
+@pytest.mark.parametrize("quantize", [False, True], ids=["onnx-fp32", "onnx-int8"])
+def test_onnx_matches_torch_reference(reference, model_dir, quantize):
+    candidate = OnnxBackend(MODEL, model_dir=model_dir, quantize=quantize)
+    report = compare_backends(reference, candidate, SAMPLE_TEXTS)
+    name = "onnx-int8" if quantize else "onnx-fp32"
+    assert report["min_cosine"] >= MIN_COSINE[name], report
+    assert report["nearest_neighbour_agreement"] == 1.0, report
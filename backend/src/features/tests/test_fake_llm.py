@@ -0,0 +1,9 @@
+from common.fake_llm import fake_response
+from mcq.app import MCQResponse, build_mcq_prompt
+
+
+def test_fake_mcq_questions_echo_the_prompt_inputs():
+    prompt = build_mcq_prompt("DBMS", "Hard", "Normalization", "Normalization, Indexing", count=5)
+    questions = fake_response(prompt, {"response_schema": MCQResponse}).parsed.questions
+    assert len(questions) == 5
+    assert {(q.subject, q.topic, q.difficulty) for q in questions} == {("DBMS", "Normalization", "Hard")}
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from youtube_transcript.global_index import GlobalIndex
+
+
+def test_failed_add_rolls_back_and_releases_the_write_lock(tmp_path):
+    index = GlobalIndex(str(tmp_path))
+    with pytest.raises(KeyError):
+        index.add("aaaaaaaaaaa", [{"start": 0.0}], np.ones((1, 4)))  # chunk without text
+    assert not index._conn.in_transaction
+
+    other_worker = GlobalIndex(str(tmp_path))
+    assert other_worker.add("bbbbbbbbbbb", [{"text": "b"}], np.ones((1, 4))) == 1
+    assert index.add("aaaaaaaaaaa", [{"text": "a"}], np.ones((1, 4))) == 1
+
+
+def test_version_changes_when_any_worker_adds_a_video(tmp_path):
+    index, other_worker = GlobalIndex(str(tmp_path)), GlobalIndex(str(tmp_path))
+    before = index.version()
+    other_worker.add("bbbbbbbbbbb", [{"text": "b"}, {"text": "c"}], np.ones((2, 4)))
+    assert index.version() != before
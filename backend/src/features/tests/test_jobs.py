@@ -0,0 +1,55 @@
+import asyncio
+
+from youtube_transcript.jobs import JobError, JobRegistry
+
+
+def test_other_worker_sees_job_state_and_progress(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+
+    async def scenario():
+        worker, other_worker = JobRegistry(path), JobRegistry(path, poll_interval=0.01)
+        step = asyncio.Event()
+
+        async def run(job_id):
+            worker.update(job_id, stage="embedding", progress=0.5)
+            await step.wait()
+            return {"summary": "done"}
+
+        job = worker.submit("video", run)
+        await asyncio.sleep(0)
+        assert other_worker.get(job["job_id"])["stage"] == "embedding"
+
+        seen = []
+
+        async def follow():
+            async for state in other_worker.watch(job["job_id"], heartbeat=5):
+                seen.append(state["status"])
+
+        follower = asyncio.create_task(follow())
+        await asyncio.sleep(0.05)
+        step.set()
+        await asyncio.wait_for(follower, timeout=5)
+        return job["job_id"], other_worker, seen
+
+    job_id, other_worker, seen = asyncio.run(scenario())
+    assert seen[0] == "running" and seen[-1] == "done"
+    assert other_worker.get(job_id)["result"] == {"summary": "done"}
+    assert other_worker.stats()["by_status"] == {"done": 1}
+
+
+def test_failed_job_error_is_shared(tmp_path):
+    path = str(tmp_path / "jobs.sqlite3")
+
+    async def scenario():
+        worker = JobRegistry(path)
+
+        async def run(job_id):
+            raise JobError("Transcript not available")
+
+        job = worker.submit("video", run)
+        while worker.get(job["job_id"])["status"] != "failed":
+            await asyncio.sleep(0.01)
+        return job["job_id"]
+
+    job_id = asyncio.run(scenario())
+    assert JobRegistry(path).get(job_id)["error"] == "Transcript not available"
@@ -0,0 +1,68 @@
+import pytest
+
+from common.skills import SkillTaxonomy
+
+
+@pytest.fixture(scope="module")
+def taxonomy():
+    return SkillTaxonomy(fuzzy=False)
+
+
+@pytest.mark.parametrize("spelling, skill", [
+    ("JS", "JavaScript"),
+    ("java script", "JavaScript"),
+    ("cpp", "C++"),
+    ("C plus plus", "C++"),
+    ("k8s", "Kubernetes"),
+    ("Postgres", "PostgreSQL"),
+    ("ReactJS", "React"),
+    ("node js", "Node.js"),
+])
+def test_spellings_share_one_id(taxonomy, spelling, skill):
+    assert taxonomy.canonical(spelling) == taxonomy.canonical(skill)
+
+
+@pytest.mark.parametrize("candidate, required", [
+    ("MySQL", "PostgreSQL"),
+    ("MySQL", "SQL"),
+    ("MongoDB", "NoSQL"),
+    ("Cassandra", "MongoDB"),
+    ("Bootstrap", "CSS"),
+    ("Tailwind", "CSS"),
+    ("GitHub", "Git"),
+    ("JPA", "Hibernate"),
+    ("Azure", "AWS"),
+    ("AWS", "Cloud"),
+    ("PyTorch", "TensorFlow"),
+    ("Keras", "Deep Learning"),
+    ("pandas", "Data Analysis"),
+    ("Bash", "Linux"),
+    ("Unix", "Linux"),
+    ("Scrum", "SDLC"),
+    ("Load Testing", "JMeter"),
+    ("SOAP", "REST API"),
+    ("REST API", "Web Services"),
+    ("Collaboration", "Teamwork"),
+    ("Coding", "Programming"),
+    ("Test Automation", "Software Testing"),
+])
+def test_related_technologies_stay_distinct(taxonomy, candidate, required):
+    assert taxonomy.canonical(candidate) != taxonomy.canonical(required)
+    assert taxonomy.canonical(required) not in taxonomy.canonical_set([candidate])
+
+
+def test_text_search_finds_only_mentioned_skills(taxonomy):
+    found = taxonomy.find_in_text("Built services in Java with Spring Boot on AWS, stored data in MySQL")
+    assert {"java", "spring_boot", "aws", "mysql"} <= found
+    assert not {"cloud", "sql", "spring"} & found
+
+
+@pytest.mark.parametrize("skill", ["DSA", "Data Structures and Algorithms", "data structures & algorithms"])
+def test_dsa_credits_data_structures_and_algorithms(taxonomy, skill):
+    assert {"dsa", "data_structures", "algorithms"} <= taxonomy.canonical_set([skill])
+    assert {"data_structures", "algorithms"} <= taxonomy.find_in_text(f"Solved 300 {skill} problems")
+
+
+def test_ds_is_not_read_as_data_structures(taxonomy):
+    assert taxonomy.canonical("DS") != taxonomy.canonical("Data Structures")
+    assert "data_structures" not in taxonomy.find_in_text("Coursework: DS, ML and statistics")
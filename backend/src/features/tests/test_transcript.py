@@ -0,0 +1,59 @@
+import io
+
+from youtube_transcript.transcript import chunk_cues, iter_caption_cues, read_caption_stream
+
+# Opening of a YouTube auto-generated English track as downloaded by yt-dlp
+# (--write-auto-subs --sub-format vtt). Each timed cue starts with a line
+# holding a single space, or with the previous caption line it rolls up from.
+AUTO_SUB_VTT = "\n".join([
+    "WEBVTT",
+    "Kind: captions",
+    "Language: en",
+    "",
+    "00:00:00.000 --> 00:00:02.500 align:start position:0%",
+    " ",
+    "hello<00:00:00.480><c> everyone</c><00:00:00.960><c> and</c><00:00:01.280><c> welcome</c>",
+    "",
+    "00:00:02.500 --> 00:00:02.510 align:start position:0%",
+    "hello everyone and welcome",
+    " ",
+    "",
+    "00:00:02.510 --> 00:00:05.120 align:start position:0%",
+    "hello everyone and welcome",
+    "to<00:00:02.800><c> today's</c><00:00:03.200><c> lecture</c><00:00:03.760><c> on</c><00:00:04.080><c> sorting</c>",
+    "",
+    "00:00:05.120 --> 00:00:05.130 align:start position:0%",
+    "to today's lecture on sorting",
+    " ",
+    "",
+    "00:00:05.130 --> 00:00:07.900 align:start position:0%",
+    "to today's lecture on sorting",
+    "we'll<00:00:05.520><c> start</c><00:00:05.840><c> with</c><00:00:06.160><c> merge</c><00:00:06.560><c> sort</c>",
+    "",
+])
+
+
+def test_space_only_line_does_not_end_auto_sub_cue():
+    cues = list(iter_caption_cues(io.StringIO(AUTO_SUB_VTT)))
+    assert [(cue["start"], cue["end"]) for cue in cues] == [
+        (0.0, 2.5), (2.5, 2.51), (2.51, 5.12), (5.12, 5.13), (5.13, 7.9)]
+    assert all(line.strip() for cue in cues for line in cue["text"].split("\n"))
+
+
+def test_auto_sub_chunks_keep_first_cue_and_timestamps():
+    cues = read_caption_stream(io.BytesIO(AUTO_SUB_VTT.encode("utf-8")))
+    assert cues == [
+        {"start": 0.0, "end": 2.5, "text": "hello everyone and welcome"},
+        {"start": 2.51, "end": 5.12, "text": "to today's lecture on sorting"},
+        {"start": 5.13, "end": 7.9, "text": "we'll start with merge sort"},
+    ]
+    chunks = chunk_cues(cues, max_tokens=256)
+    assert chunks[0]["start"] == 0.0
+    assert chunks[0]["text"].startswith("hello everyone and welcome")
+
+
+def test_empty_line_still_ends_srt_block():
+    srt = "1\r\n00:00:01,000 --> 00:00:02,000\r\nfirst line\r\n\r\n2\r\n00:00:02,000 --> 00:00:03,500\r\nsecond\r\n"
+    cues = list(iter_caption_cues(io.StringIO(srt, newline="")))
+    assert cues == [{"start": 1.0, "end": 2.0, "text": "first line"},
+                    {"start": 2.0, "end": 3.5, "text": "second"}]
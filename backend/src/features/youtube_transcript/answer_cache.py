@@ -0,0 +1,146 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import numpy as np
+
+# Upper edges of the best-similarity histogram kept for threshold tuning
+SIMILARITY_BUCKETS = (0.8, 0.85, 0.9, 0.93, 0.95, 0.97, 0.99, 1.01)
+
+
+def normalize_question(text: str) -> str:
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+class QueryEmbeddingCache:
+    """LRU of question text -> embedding, so repeated questions skip the encoder."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_encode(self, text: str, encode: Callable[[list], np.ndarray]) -> np.ndarray:
+        """Return the (1, dim) embedding of `text`, encoding it on a miss."""
+        key = normalize_question(text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return embedding
+            self.misses += 1
+
+        embedding = encode([text])
+        with self._lock:
+            self._entries[key] = embedding
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return embedding
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class SemanticAnswerCache:
+    """
+    Answers already given for a scope (one video, a set of videos, or the
+    whole index), keyed by question embedding. A new question whose cosine
+    similarity to a cached one is at least `threshold` reuses its answer.
+
+    Scopes and the answers inside each scope are both evicted LRU, and
+    answers expire after `ttl_seconds`. `stats` includes a histogram of the
+    best similarity seen per lookup, to tune the threshold.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_per_scope: int = 256, max_scopes: int = 512,
+                 ttl_seconds: float = 24 * 3600):
+        self.threshold = threshold
+        self.max_per_scope = max_per_scope
+        self.max_scopes = max_scopes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "ttl": 0}
+        self.similarity_histogram = [0] * len(SIMILARITY_BUCKETS)
+        self._scopes = OrderedDict()  # scope -> OrderedDict(question -> (embedding, answer, stored_at))
+        self._lock = threading.Lock()
+
+    def _record_similarity(self, similarity: float) -> None:
+        for i, upper in enumerate(SIMILARITY_BUCKETS):
+            if similarity < upper:
+                self.similarity_histogram[i] += 1
+                return
+
+    def lookup(self, scope: str, embedding: np.ndarray) -> Optional[dict]:
+        """The cached answer closest to `embedding` if within the threshold, plus its similarity."""
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        with self._lock:
+            entries = self._scopes.get(scope)
+            if entries and self.ttl_seconds:
+                cutoff = time.time() - self.ttl_seconds
+                for question in [q for q, (_, _, stored_at) in entries.items() if stored_at < cutoff]:
+                    del entries[question]
+                    self.evictions["ttl"] += 1
+            if not entries:
+                self.misses += 1
+                return None
+
+            questions = list(entries)
+            similarities = np.stack([entries[q][0] for q in questions]) @ embedding
+            best = int(similarities.argmax())
+            similarity = float(similarities[best])
+            self._record_similarity(similarity)
+            if similarity < self.threshold:
+                self.misses += 1
+                return None
+
+            self._scopes.move_to_end(scope)
+            entries.move_to_end(questions[best])
+            self.hits += 1
+            return {"answer": entries[questions[best]][1], "question": questions[best], "similarity": similarity}
+
+    def store(self, scope: str, question: str, embedding: np.ndarray, answer) -> None:
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        with self._lock:
+            entries = self._scopes.setdefault(scope, OrderedDict())
+            self._scopes.move_to_end(scope)
+            question = normalize_question(question)
+            entries[question] = (embedding, answer, time.time())
+            entries.move_to_end(question)
+            while len(entries) > self.max_per_scope:
+                entries.popitem(last=False)
+                self.evictions["lru"] += 1
+            while len(self._scopes) > self.max_scopes:
+                _, evicted = self._scopes.popitem(last=False)
+                self.evictions["lru"] += len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            answers = sum(len(entries) for entries in self._scopes.values())
+        lookups = self.hits + self.misses
+        return {
+            "scopes": len(self._scopes),
+            "answers": answers,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": dict(self.evictions),
+            "best_similarity_histogram": {f"<{upper:g}": count for upper, count
+                                          in zip(SIMILARITY_BUCKETS, self.similarity_histogram)},
+        }
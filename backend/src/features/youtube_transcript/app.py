@@ -1,46 +1,159 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 import uvicorn
 import re
 import numpy as np
 import faiss
-import torch
 import yt_dlp
-import webvtt
-from sentence_transformers import SentenceTransformer, util
 from google import genai
 from dotenv  import load_dotenv
 import os
+import atexit
+import asyncio
+import json
 import tempfile
+import threading
+
+from common import llm_gateway, metrics
+from common.disk_cache import DiskCache
+from common.process_pool import PoolBusyError, get_pool
+from .answer_cache import QueryEmbeddingCache, SemanticAnswerCache
+from .embeddings import create_backend, encode_in_process
+from .global_index import GlobalIndex
+from .jobs import JobError, JobRegistry
+from .summarizer import MapReduceSummarizer
+from .transcript import (CAPTION_EXTENSIONS, caption_file_id, chunk_cues, cues_to_text, normalize_chunks,
+                         read_caption_file, read_caption_stream)
+from .video_store import VideoMemory, VideoStore, is_valid_video_id
 load_dotenv()
 # ========= Configuration =========
 app = FastAPI()
-client  = genai.Client(api_key=os.getenv("Test_API_KEY"))
 model = os.getenv("GEMINI_MODEL")
 config = genai.types.GenerateContentConfig(
     system_instruction="You are an educational assistant that helps users understand YouTube video content. You provide summaries and answer questions based STRICTLY on the video transcript provided. Never use information outside what's explicitly in the transcript. If asked about something not covered in the transcript, respond with 'This information is not available in the transcript.'",
     temperature=0.3,
     response_mime_type="text/plain"
 )
-embed_model = SentenceTransformer("all-MiniLM-L6-v2")
+# Above this many chunks /ask switches from exact search to an HNSW graph
+HNSW_MIN_CHUNKS = int(os.getenv("YOUTUBE_HNSW_MIN_CHUNKS", 2000))
+# Token budget per transcript chunk, and how much of a chunk's tail is repeated in the next
+CHUNK_TOKENS = int(os.getenv("YOUTUBE_CHUNK_TOKENS", 256))
+CHUNK_OVERLAP_TOKENS = int(os.getenv("YOUTUBE_CHUNK_OVERLAP_TOKENS", 32))
+
+# Local caption files (.vtt/.srt) can only be ingested from inside this directory
+INGEST_ROOT = os.path.realpath(os.getenv(
+    "YOUTUBE_INGEST_ROOT", os.path.join(os.path.dirname(os.path.abspath(__file__)), "captions")))
+# Chunks are embedded in batches on a dedicated pool so the CPU model is never oversubscribed.
+# YOUTUBE_EMBED_POOL_MODE=process runs them in separate worker processes, off the server's GIL.
+EMBED_BATCH_SIZE = int(os.getenv("YOUTUBE_EMBED_BATCH_SIZE", 64))
+embed_pool = get_pool("youtube_embed", workers=int(os.getenv("YOUTUBE_EMBED_WORKERS", 1)), max_queue=8)
+# "torch" (sentence-transformers), "onnx" (int8 ONNX Runtime) or "onnx-fp32"; loaded on first use
+EMBED_BACKEND = os.getenv("YOUTUBE_EMBED_BACKEND", "torch")
+EMBED_THREADS = int(os.getenv("YOUTUBE_EMBED_THREADS", 0))  # intra-op CPU threads, 0 = library default
+embedder = create_backend(EMBED_BACKEND, threads=EMBED_THREADS)
+
+# ========= Storage =========
+# Processed videos persist on disk (shared by all workers); hot ones are also kept in RAM
+VIDEO_STORE_DIR = os.getenv("YOUTUBE_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "store"))
+video_store = VideoStore(VIDEO_STORE_DIR)
+video_memory = VideoMemory(
+    max_entries=int(os.getenv("YOUTUBE_MEMORY_MAX_VIDEOS", 32)),
+    max_bytes=int(os.getenv("YOUTUBE_MEMORY_MAX_BYTES", 512 * 1024 * 1024)),
+    ttl_seconds=float(os.getenv("YOUTUBE_MEMORY_TTL_SECONDS", 6 * 3600)),
+)
+
+def load_stored_embeddings(video_id: str) -> np.ndarray | None:
+    stored = video_store.load(video_id)
+    return stored["embeddings"] if stored else None
+
+# One index over every chunk of every loaded video, for cross-lecture search.
+# Vectors other workers commit are pulled in from the video store before searches and flushes.
+global_index = GlobalIndex(
+    os.path.join(VIDEO_STORE_DIR, "_global"),
+    index_type=os.getenv("YOUTUBE_GLOBAL_INDEX_TYPE", "hnsw"),
+    load_embeddings=load_stored_embeddings,
+)
+atexit.register(global_index.flush)
 
-# ========= In-memory storage =========
-video_memory = {}
+# ========= Background Jobs =========
+# /summary runs as a job: at most YOUTUBE_JOB_WORKERS videos are processed at once per worker.
+# Job state is kept in SQLite so /status answers from any worker, not just the one running the job.
+job_registry = JobRegistry(
+    os.path.join(VIDEO_STORE_DIR, "_jobs", "jobs.sqlite3"),
+    max_workers=int(os.getenv("YOUTUBE_JOB_WORKERS", 4)),
+    ttl_seconds=float(os.getenv("YOUTUBE_JOB_TTL_SECONDS", 3600)),
+)
+
+# Repeated questions skip the encoder, and near-identical ones (cosine >= threshold)
+# about the same videos reuse the earlier answer instead of calling Gemini again
+query_cache = QueryEmbeddingCache(max_entries=int(os.getenv("YOUTUBE_QUERY_CACHE_SIZE", 1024)))
+answer_cache = SemanticAnswerCache(
+    threshold=float(os.getenv("YOUTUBE_ANSWER_CACHE_THRESHOLD", 0.95)),
+    max_per_scope=int(os.getenv("YOUTUBE_ANSWER_CACHE_MAX_PER_VIDEO", 256)),
+    max_scopes=int(os.getenv("YOUTUBE_ANSWER_CACHE_MAX_VIDEOS", 512)),
+    ttl_seconds=float(os.getenv("YOUTUBE_ANSWER_CACHE_TTL_SECONDS", 24 * 3600)),
+)
+
+metrics.register_cache("youtube_memory", video_memory.stats)
+metrics.register_cache("youtube_query_embeddings", query_cache.stats)
+metrics.register_cache("youtube_answers", answer_cache.stats)
+
+# Whole-transcript summaries: every chunk of each k-means cluster summarized in parallel, then merged.
+# Section summaries are cached so re-summarizing a video reuses them.
+summarizer = MapReduceSummarizer(
+    DiskCache(
+        os.path.join(VIDEO_STORE_DIR, "_cache", "summary_cache.sqlite3"),
+        ttl_seconds=float(os.getenv("YOUTUBE_SUMMARY_CACHE_TTL_SECONDS", 30 * 24 * 3600)),
+        max_entries=int(os.getenv("YOUTUBE_SUMMARY_CACHE_MAX_ENTRIES", 5000)),
+        max_bytes=int(os.getenv("YOUTUBE_SUMMARY_CACHE_MAX_BYTES", 64 * 1024 * 1024)),
+    ),
+    model=model,
+    config=config,
+    # Topical clusters; each is summarized in full, in sections of at most SECTION_TOKENS of transcript
+    max_clusters=int(os.getenv("YOUTUBE_SUMMARY_MAX_CLUSTERS", 8)),
+    section_tokens=int(os.getenv("YOUTUBE_SUMMARY_SECTION_TOKENS", 3000)),
+    # Section summaries merged per reduce step
+    reduce_fanout=int(os.getenv("YOUTUBE_SUMMARY_REDUCE_FANOUT", 4)),
+)
+metrics.register_cache("youtube_summary_sections", summarizer.cache.stats)
 
 # ========= Request Models =========
+# Upper bound on top_k for /ask and /search
+MAX_TOP_K = int(os.getenv("YOUTUBE_MAX_TOP_K", 50))
+
 class VideoRequest(BaseModel):
     url: str
+    # Rebuild the summary of an already loaded video (cached section summaries are reused)
+    refresh: bool = False
 
 class ChatRequest(BaseModel):
-    session_id : str
+    session_id : str | None = None
     question: str
+    # Answer from several loaded videos, or from every indexed video with scope="all"
+    session_ids: list[str] | None = None
+    scope: str = "session"
+    top_k: int = Field(default=3, ge=1, le=MAX_TOP_K)
+
+class LocalIngestRequest(BaseModel):
+    # A caption file or a directory of them, relative to YOUTUBE_INGEST_ROOT
+    path: str
+
+class SearchRequest(BaseModel):
+    query: str
+    top_k: int = Field(default=5, ge=1, le=MAX_TOP_K)
 
 # ========= Helper Functions =========
 def extract_video_id(url: str) -> str:
     match = re.search(r"(?:v=|\/)([0-9A-Za-z_-]{11})", url)
     return match.group(1) if match else None
 
-def get_transcript(video_id: str) -> str | None:
+def is_youtube_id(video_id: str) -> bool:
+    # Caption files ingested offline get "local-<hash>" ids instead
+    return re.fullmatch(r"[0-9A-Za-z_-]{11}", video_id) is not None
+
+def get_transcript(video_id: str) -> list[dict] | None:
+    """Caption cues ({start, end, text}, seconds) with rolling auto-caption repeats removed."""
     video_url = f"https://www.youtube.com/watch?v={video_id}"
     with tempfile.TemporaryDirectory() as tmpdir:
         try:
@@ -59,78 +172,267 @@ def get_transcript(video_id: str) -> str | None:
             if not os.path.exists(vtt_path):
                 return None
 
-            transcript = " ".join([caption.text for caption in webvtt.read(vtt_path)])
-            return transcript
+            return read_caption_file(vtt_path)
 
         except Exception as e:
             print(f"[Transcript Error] {e}")
             return None
 
-def chunk_text(text: str, chunk_size=1000, overlap=200) -> list[str]:
-    words = text.split()
-    chunks = []
-    i = 0
-    while i < len(words):
-        chunks.append(" ".join(words[i:i + chunk_size]))
-        i += chunk_size - overlap
-    return chunks
+def video_link(video_id: str, start: float | None) -> str | None:
+    if not is_youtube_id(video_id):
+        return None
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    return f"{url}&t={int(start)}s" if start is not None else url
+
+def encode(texts: list[str]) -> np.ndarray:
+    """Unit-length float32 embeddings, so inner product equals cosine similarity."""
+    return embedder.encode(texts)
+
+async def encode_on_pool(texts: list[str]) -> np.ndarray:
+    # Background jobs wait for a free slot instead of failing when the pool is saturated
+    while True:
+        try:
+            if embed_pool.mode == "process":
+                return await embed_pool.run(encode_in_process, EMBED_BACKEND, embedder.model_name, EMBED_THREADS, texts)
+            return await embed_pool.run(encode, texts)
+        except PoolBusyError:
+            await asyncio.sleep(0.2)
+
+async def encode_batched(texts: list[str], on_progress=None) -> np.ndarray:
+    """`encode` in EMBED_BATCH_SIZE batches on the embedding pool, reporting (done, total) after each."""
+    batches = []
+    for start in range(0, len(texts), EMBED_BATCH_SIZE):
+        batches.append(await encode_on_pool(texts[start:start + EMBED_BATCH_SIZE]))
+        if on_progress:
+            on_progress(min(start + EMBED_BATCH_SIZE, len(texts)), len(texts))
+    return np.concatenate(batches)
+
+def build_index(embeddings: np.ndarray) -> faiss.Index:
+    """Inner-product index over normalized vectors; the FAISS index is the only copy kept in RAM."""
+    embeddings = np.array(embeddings, dtype=np.float32)  # copy: stored arrays may be read-only memmaps
+    faiss.normalize_L2(embeddings)
+    if len(embeddings) >= HNSW_MIN_CHUNKS:
+        index = faiss.IndexHNSWFlat(embeddings.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efSearch = 64
+    else:
+        index = faiss.IndexFlatIP(embeddings.shape[1])
+    index.add(embeddings)
+    return index
+
+def search_index(index: faiss.Index, query_embedding: np.ndarray, top_k: int = 3) -> list[tuple[int, float]]:
+    scores, ids = index.search(query_embedding, min(top_k, index.ntotal))
+    return [(int(i), float(score)) for i, score in zip(ids[0], scores[0]) if i >= 0]
+
+def build_memory_entry(chunks: list, embeddings: np.ndarray, summary: str) -> dict:
+    return {
+        "chunks": normalize_chunks(chunks),
+        "index": build_index(embeddings),
+        "summary": summary
+    }
+
+def get_video_memory(video_id: str) -> dict | None:
+    """Look the video up in RAM first, then in the on-disk store."""
+    memory = video_memory.get(video_id)
+    if memory is not None:
+        return memory
+
+    stored = video_store.load(video_id)
+    if stored is None:
+        return None
+    memory = build_memory_entry(stored["chunks"], stored["embeddings"], stored["summary"])
+    video_memory.put(video_id, memory)
+    if not global_index.contains(video_id):
+        global_index.add(video_id, stored["chunks"], stored["embeddings"])
+    return memory
+
+# Recover vectors whose metadata was committed but never flushed to global.faiss
+threading.Thread(target=global_index.reconcile, daemon=True).start()
 
-def generate_summary(context: str) -> str:
-    prompt = f"Summarize the following video transcript in bullet points using markdown:\n\n{context}\n\nSummary:"
+async def process_video(job_id: str, video_id: str, load_cues=None, meta: dict | None = None) -> dict:
+    """
+    Transcript -> chunks -> batched embeddings -> summary -> store, reporting
+    progress on the job. `load_cues` defaults to downloading the YouTube captions.
+    """
+    # yt-dlp, file parsing and the embedding model are blocking, keep them off the event loop
+    job_registry.update(job_id, stage="transcript", progress=0.05)
+    cues = await asyncio.to_thread(load_cues or (lambda: get_transcript(video_id)))
+    if not cues:
+        raise JobError("Transcript not available")
 
-    response = client.models.generate_content(
-        model=model,contents=prompt, config=config)
-    return response.text.strip()
+    job_registry.update(job_id, stage="chunking", progress=0.15)
+    transcript = cues_to_text(cues)
+    chunks = chunk_cues(cues, max_tokens=CHUNK_TOKENS, overlap_tokens=CHUNK_OVERLAP_TOKENS)
+
+    job_registry.update(job_id, stage="embedding", progress=0.2, chunks=len(chunks))
+    embeddings = await encode_batched(
+        [chunk["text"] for chunk in chunks],
+        on_progress=lambda done, total: job_registry.update(job_id, progress=round(0.2 + 0.6 * done / total, 3)))
+    job_registry.update(job_id, stage="summarizing", progress=0.8)
+    summary = await summarize(job_id, chunks, embeddings, start=0.8, span=0.15)
+
+    job_registry.update(job_id, stage="saving", progress=0.95)
+    # Persist for other workers and restarts, then keep it hot in memory
+    await asyncio.to_thread(video_store.save, video_id, transcript, chunks, embeddings, summary,
+                            {"embedding_model": embedder.model_name, "embedding_backend": embedder.name, "normalized": True} | (meta or {}))
+    video_memory.put(video_id, build_memory_entry(chunks, embeddings, summary))
+    await asyncio.to_thread(global_index.add, video_id, chunks, embeddings)
+
+    return {"session_id": video_id, "summary": summary}
+
+async def summarize(job_id: str, chunks: list, embeddings: np.ndarray, start: float, span: float) -> str:
+    return await summarizer.summarize(
+        [chunk["text"] for chunk in chunks], embeddings,
+        on_progress=lambda done, total: job_registry.update(job_id, progress=round(start + span * done / total, 3)))
+
+async def resummarize_video(job_id: str, video_id: str) -> dict:
+    """Rebuild the summary of a stored video from its saved chunks and embeddings."""
+    job_registry.update(job_id, stage="summarizing", progress=0.1)
+    stored = await asyncio.to_thread(video_store.load, video_id)
+    if stored is None:
+        raise JobError("Video not loaded")
+    chunks = normalize_chunks(stored["chunks"])
+    summary = await summarize(job_id, chunks, stored["embeddings"], start=0.1, span=0.8)
+
+    job_registry.update(job_id, stage="saving", progress=0.95)
+    transcript = await asyncio.to_thread(video_store.load_transcript, video_id)
+    await asyncio.to_thread(video_store.save, video_id, transcript or "", stored["chunks"],
+                            stored["embeddings"], summary, stored["meta"])
+    video_memory.put(video_id, build_memory_entry(chunks, stored["embeddings"], summary))
+    return {"session_id": video_id, "summary": summary}
 
 # ========= API Routes =========
 
-@app.post("/summary")
-def load_video(req: VideoRequest):
+@app.post("/summary", status_code=202)
+async def load_video(req: VideoRequest):
+    """
+    Start processing a video and return its job id; poll /status/{job_id} or
+    stream /status/{job_id}/stream for the summary. Videos that are already
+    loaded are answered immediately.
+    """
     video_id = extract_video_id(req.url)
     if not video_id:
         raise HTTPException(status_code=400, detail="Invalid YouTube URL")
 
-    if video_id in video_memory:
-        return {"message": "Video already loaded.", "summary": video_memory[video_id]["summary"]}
+    memory = await asyncio.to_thread(get_video_memory, video_id)
+    if memory is not None and not req.refresh:
+        return {"message": "Video already loaded.", "status": "done", "session_id": video_id,
+                "summary": memory["summary"]}
 
-    transcript = get_transcript(video_id)
-    if not transcript:
-        raise HTTPException(status_code=404, detail="Transcript not available")
+    if memory is not None:
+        job = job_registry.submit(video_id, lambda job_id: resummarize_video(job_id, video_id))
+    else:
+        job = job_registry.submit(video_id, lambda job_id: process_video(job_id, video_id))
+    return {"job_id": job["job_id"], "status": job["status"], "session_id": video_id}
 
-    chunks = chunk_text(transcript)
-    embeddings = embed_model.encode(chunks, convert_to_tensor=True)
+def submit_caption_job(video_id: str, name: str, load_cues) -> dict:
+    """Queue one caption file through the same pipeline as /summary; files already stored are skipped."""
+    if video_store.exists(video_id):
+        return {"file": name, "session_id": video_id, "job_id": None, "status": "done"}
+    job = job_registry.submit(video_id, lambda job_id: process_video(
+        job_id, video_id, load_cues, {"source": "captions", "file": name}))
+    return {"file": name, "session_id": video_id, "job_id": job["job_id"], "status": job["status"]}
 
-    index = faiss.IndexFlatL2(embeddings.shape[1])
-    index.add(embeddings.cpu().numpy())
+@app.post("/summary/upload", status_code=202)
+async def load_caption_uploads(files: list[UploadFile] = File(...)):
+    """Ingest uploaded .vtt/.srt caption files, one background job per file."""
+    for upload in files:
+        if not (upload.filename or "").lower().endswith(CAPTION_EXTENSIONS):
+            raise HTTPException(status_code=400, detail=f"{upload.filename}: only .vtt and .srt files are supported")
 
-    # Get central context for summary
-    centroid = torch.mean(embeddings, dim=0, keepdim=True)
-    dists = torch.norm(embeddings - centroid, dim=1)
-    top_k = torch.topk(dists, k=5, largest=False).indices
-    context = "\n".join([chunks[i] for i in top_k])
-    summary = generate_summary(context)
+    async def parse(upload: UploadFile):
+        # Uploads are closed once the request ends, so they are parsed (streaming) here
+        video_id = await asyncio.to_thread(caption_file_id, upload.file)
+        cues = None if video_store.exists(video_id) else await asyncio.to_thread(read_caption_stream, upload.file)
+        return upload.filename, video_id, cues
 
-    # Store in memory
-    video_memory[video_id] = {
-        "chunks": chunks,
-        "embeddings": embeddings,
-        "index": index,
-        "summary": summary
-    }
+    parsed = await asyncio.gather(*(parse(upload) for upload in files))
+    return {"jobs": [submit_caption_job(video_id, name, lambda cues=cues: cues) for name, video_id, cues in parsed]}
 
-    return {"session_id": video_id, "summary": summary}
+@app.post("/summary/local", status_code=202)
+async def load_local_captions(req: LocalIngestRequest):
+    """
+    Ingest a caption file or every .vtt/.srt file under a directory inside
+    YOUTUBE_INGEST_ROOT, e.g. to pre-warm a whole course offline. Files are
+    processed in parallel by the job workers.
+    """
+    path = os.path.realpath(os.path.join(INGEST_ROOT, req.path))
+    if os.path.commonpath([path, INGEST_ROOT]) != INGEST_ROOT or not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"{req.path} not found under the ingest directory")
+
+    if os.path.isdir(path):
+        paths = sorted(os.path.join(directory, name) for directory, _, names in os.walk(path)
+                       for name in names if name.lower().endswith(CAPTION_EXTENSIONS))
+    else:
+        paths = [path] if path.lower().endswith(CAPTION_EXTENSIONS) else []
+    if not paths:
+        raise HTTPException(status_code=400, detail="No .vtt or .srt files found")
+
+    def file_id(file_path):
+        with open(file_path, "rb") as file:
+            return caption_file_id(file)
+
+    video_ids = await asyncio.gather(*(asyncio.to_thread(file_id, file_path) for file_path in paths))
+    return {"jobs": [submit_caption_job(video_id, os.path.relpath(file_path, INGEST_ROOT),
+                                        lambda file_path=file_path: read_caption_file(file_path))
+                     for file_path, video_id in zip(paths, video_ids)]}
+
+@app.get("/status/{job_id}")
+async def job_status(job_id: str):
+    job = job_registry.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+    return job
+
+@app.get("/status/{job_id}/stream")
+async def job_status_stream(job_id: str):
+    """Server-sent events with the job state on every progress change, ending when it finishes."""
+    if job_registry.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown job id")
+
+    async def events():
+        async for job in job_registry.watch(job_id):
+            yield ": keep-alive\n\n" if job is None else f"data: {json.dumps(job)}\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
 
 @app.post("/ask")
-def chat(req: ChatRequest):
-    video_id = req.session_id
-    if video_id not in video_memory:
-        raise HTTPException(status_code=404, detail="Video not loaded. Please load it first.")
+async def chat(req: ChatRequest):
+    video_ids = req.session_ids or ([req.session_id] if req.session_id else [])
+    if req.scope != "all" and not video_ids:
+        raise HTTPException(status_code=400, detail="Provide session_id, session_ids or scope='all'.")
+    invalid = [video_id for video_id in video_ids if not is_valid_video_id(video_id)]
+    if req.scope != "all" and invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid session id: {invalid[0]}")
+
+    query_embedding = await asyncio.to_thread(query_cache.get_or_encode, req.question, encode)
+    # Answers over every video are keyed by the index version, so newly indexed videos invalidate them
+    scope = f"all@{global_index.version()}" if req.scope == "all" else ",".join(sorted(set(video_ids)))
+    answer_scope = f"{scope}:{req.top_k}"
+    cached = answer_cache.lookup(answer_scope, query_embedding)
+    if cached is not None:
+        return cached["answer"] | {"cached": True, "similarity": round(cached["similarity"], 4)}
 
-    memory = video_memory[video_id]
-    query_embedding = embed_model.encode([req.question], convert_to_tensor=True)
+    if req.scope == "all":
+        hits = await asyncio.to_thread(global_index.search, query_embedding[0], req.top_k)
+        sources = [{"video_id": hit["video_id"], "chunk_index": hit["chunk_index"], "start": hit["start"],
+                    "end": hit["end"], "score": hit["score"], "text": hit["text"]} for hit in hits]
+    else:
+        sources = []
+        for video_id in video_ids:
+            memory = await asyncio.to_thread(get_video_memory, video_id)
+            if memory is None:
+                raise HTTPException(status_code=404, detail=f"Video {video_id} not loaded. Please load it first.")
+            for i, score in search_index(memory["index"], query_embedding, top_k=req.top_k):
+                chunk = memory["chunks"][i]
+                sources.append({"video_id": video_id, "chunk_index": i, "start": chunk["start"],
+                                "end": chunk["end"], "score": score, "text": chunk["text"]})
+        sources = sorted(sources, key=lambda source: source["score"], reverse=True)[:req.top_k]
 
-    hits = util.semantic_search(query_embedding, memory["embeddings"], top_k=3)[0]
-    context = "\n".join([memory["chunks"][hit["corpus_id"]] for hit in hits])
+    if len({source["video_id"] for source in sources}) > 1:
+        context = "\n".join(f"[Video {source['video_id']}] {source['text']}" for source in sources)
+    else:
+        context = "\n".join(source["text"] for source in sources)
 
     prompt = (
         "You are a helpful assistant. Use the transcript below to answer the user's question as accurately as possible. "
@@ -140,16 +442,33 @@ def chat(req: ChatRequest):
         "**Answer:**"
     )
 
-    response = client.models.generate_content(
+    response = await llm_gateway.generate_content(
         model=model,
         contents=prompt,
         config=config
     )
 
     # Return answer as markdown with question included
-    return {
-        "answer": response.text.strip()
+    result = {
+        "answer": response.text.strip(),
+        "sources": [{key: value for key, value in source.items() if key != "text"}
+                    | {"url": video_link(source["video_id"], source["start"])} for source in sources]
     }
+    answer_cache.store(answer_scope, req.question, query_embedding, result)
+    return result | {"cached": False}
+
+@app.post("/search")
+async def search(req: SearchRequest):
+    """Best matching transcript segments across every loaded video."""
+    query_embedding = await asyncio.to_thread(query_cache.get_or_encode, req.query, encode)
+    results = await asyncio.to_thread(global_index.search, query_embedding[0], req.top_k)
+    return {"results": [result | {"url": video_link(result["video_id"], result["start"])} for result in results]}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return video_memory.stats() | {"global_index": global_index.stats(), "jobs": job_registry.stats(),
+                                   "embedding_backend": {"name": embedder.name, "loaded": embedder.loaded},
+                                   "query_embeddings": query_cache.stats(), "answers": answer_cache.stats()}
 
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -0,0 +1,227 @@
+import inspect
+import os
+import sys
+import threading
+from typing import List, Optional
+
+import numpy as np
+
+DEFAULT_MODEL = "all-MiniLM-L6-v2"
+
+
+class EmbeddingBackend:
+    """
+    Sentence embedding model loaded on first use, so importing the YouTube
+    feature costs nothing until a video is actually processed. `encode`
+    always returns unit-length float32 rows.
+    """
+
+    name = "base"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, threads: int = 0):
+        self.model_name = model_name
+        self.threads = threads
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._load()
+                self._loaded = True
+
+    def _load(self) -> None:
+        raise NotImplementedError
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self._ensure_loaded()
+        embeddings = np.asarray(self._encode(texts), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return np.ascontiguousarray(embeddings / np.clip(norms, 1e-12, None))
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+    """The reference PyTorch path (sentence-transformers on CPU)."""
+
+    name = "torch"
+
+    def _load(self) -> None:
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if self.threads:
+            torch.set_num_threads(self.threads)
+        self._model = SentenceTransformer(self.model_name, device="cpu")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self._model.encode(texts, convert_to_numpy=True, normalize_embeddings=True)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """
+    ONNX Runtime CPU path, int8 dynamically quantized by default.
+
+    The model is exported from the sentence-transformers checkpoint into
+    `model_dir` the first time it is needed (this one-off step still needs
+    torch); later loads only need onnxruntime and the saved tokenizer.
+    Pooling matches all-MiniLM-L6-v2: attention-masked mean, then L2 norm.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_name: str = DEFAULT_MODEL, threads: int = 0,
+                 model_dir: Optional[str] = None, quantize: bool = True, max_length: int = 256):
+        super().__init__(model_name, threads)
+        self.model_dir = model_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), "models",
+                                                   model_name.replace("/", "__"))
+        self.quantize = quantize
+        self.max_length = max_length
+        if quantize:
+            self.name = "onnx-int8"
+
+    @property
+    def model_path(self) -> str:
+        return os.path.join(self.model_dir, "model.int8.onnx" if self.quantize else "model.onnx")
+
+    def _load(self) -> None:
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("onnxruntime is required for YOUTUBE_EMBED_BACKEND=onnx") from e
+        from transformers import AutoTokenizer
+
+        if not os.path.exists(self.model_path):
+            export_onnx(self.model_name, self.model_dir, quantize=self.quantize)
+
+        options = ort.SessionOptions()
+        if self.threads:
+            options.intra_op_num_threads = self.threads
+        self._session = ort.InferenceSession(self.model_path, options, providers=["CPUExecutionProvider"])
+        self._input_names = [graph_input.name for graph_input in self._session.get_inputs()]
+        self._tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        tokens = self._tokenizer(texts, padding=True, truncation=True, max_length=self.max_length,
+                                 return_tensors="np")
+        feeds = {name: tokens[name].astype(np.int64) for name in self._input_names if name in tokens}
+        hidden = self._session.run(None, feeds)[0]
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        return (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+
+def export_onnx(model_name: str, model_dir: str, quantize: bool = True) -> str:
+    """Export the transformer behind a sentence-transformers model to ONNX (and int8). Returns the model path."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(model_dir, exist_ok=True)
+    transformer = SentenceTransformer(model_name, device="cpu")[0]
+    transformer.tokenizer.save_pretrained(model_dir)
+    auto_model = transformer.auto_model.eval()
+
+    sample = transformer.tokenizer(["export sample"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]}
+
+    class HiddenStates(torch.nn.Module):
+        # Traced entry point: the tokenizer inputs positionally, passed on by keyword, so the
+        # export doesn't depend on the argument order of the model's forward()
+        def __init__(self):
+            super().__init__()
+            self.model = auto_model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)), return_dict=False)[0]
+
+    fp32_path = os.path.join(model_dir, "model.onnx")
+    # Newer torch defaults to the dynamo exporter (needs onnxscript); dynamic_axes is the TorchScript exporter's API
+    export_options = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(HiddenStates().eval(), tuple(sample[name] for name in input_names), fp32_path,
+                          input_names=input_names, output_names=["last_hidden_state"],
+                          dynamic_axes=dynamic_axes, opset_version=14, **export_options)
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = os.path.join(model_dir, "model.int8.onnx")
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+def create_backend(kind: str = "torch", model_name: str = DEFAULT_MODEL, threads: int = 0) -> EmbeddingBackend:
+    """`kind` is "torch", "onnx" (int8) or "onnx-fp32"."""
+    if kind == "torch":
+        return SentenceTransformerBackend(model_name, threads=threads)
+    if kind in ("onnx", "onnx-int8"):
+        return OnnxBackend(model_name, threads=threads, quantize=True)
+    if kind == "onnx-fp32":
+        return OnnxBackend(model_name, threads=threads, quantize=False)
+    raise ValueError(f"Unknown embedding backend '{kind}'")
+
+
+_process_backends = {}
+
+
+def encode_in_process(kind: str, model_name: str, threads: int, texts: List[str]) -> np.ndarray:
+    """Pool worker entry point: encode with a backend created once per worker process."""
+    key = (kind, model_name, threads)
+    if key not in _process_backends:
+        _process_backends[key] = create_backend(kind, model_name, threads)
+    return _process_backends[key].encode(texts)
+
+
+def compare_backends(reference: EmbeddingBackend, candidate: EmbeddingBackend, texts: List[str]) -> dict:
+    """
+    How closely `candidate` reproduces `reference`: per-text cosine between
+    the two embeddings, and how often both pick the same nearest neighbour.
+    """
+    expected, actual = reference.encode(texts), candidate.encode(texts)
+    cosine = (expected * actual).sum(axis=1)
+
+    def nearest(embeddings):
+        similarity = embeddings @ embeddings.T
+        np.fill_diagonal(similarity, -np.inf)
+        return similarity.argmax(axis=1)
+
+    return {
+        "texts": len(texts),
+        "min_cosine": float(cosine.min()),
+        "mean_cosine": float(cosine.mean()),
+        "nearest_neighbour_agreement": float((nearest(expected) == nearest(actual)).mean()),
+    }
+
+
+SAMPLE_TEXTS = [
+    "A process is a program in execution with its own address space.",
+    "Threads of the same process share memory but have separate stacks.",
+    "Paging divides memory into fixed-size frames to avoid external fragmentation.",
+    "A deadlock needs mutual exclusion, hold and wait, no preemption and circular wait.",
+    "TCP provides reliable, ordered delivery using sequence numbers and acknowledgements.",
+    "UDP is connectionless and is used for DNS queries and streaming.",
+    "A primary key uniquely identifies each row of a relational table.",
+    "Normalization to third normal form removes transitive dependencies.",
+    "Polymorphism lets one interface be used for different underlying forms.",
+    "Encapsulation hides an object's internal state behind its methods.",
+]
+
+
+if __name__ == "__main__":
+    # Equivalence check of a fast backend against the torch reference:
+    #   python -m youtube_transcript.embeddings [onnx|onnx-fp32] [min_cosine]
+    kind = sys.argv[1] if len(sys.argv) > 1 else "onnx"
+    min_cosine = float(sys.argv[2]) if len(sys.argv) > 2 else 0.98
+    report = compare_backends(create_backend("torch"), create_backend(kind), SAMPLE_TEXTS)
+    print(report)
+    if report["min_cosine"] < min_cosine or report["nearest_neighbour_agreement"] < 1.0:
+        sys.exit(f"{kind} embeddings diverge from the torch reference")
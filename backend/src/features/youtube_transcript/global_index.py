@@ -0,0 +1,225 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional
+
+import faiss
+import numpy as np
+
+
+class GlobalIndex:
+    """
+    Cross-video semantic index over every transcript chunk ever loaded.
+
+    Vectors live in a FAISS IndexIDMap2 (HNSW by default, so queries stay in
+    the millisecond range at thousands of videos) and chunk metadata
+    (video id, chunk position, time range, text) in SQLite, keyed by the
+    same int64 id. Videos are added incrementally; the index file is
+    flushed to disk at most every `save_interval` seconds and on exit.
+
+    SQLite is the source of truth shared by every worker process. Before a
+    search or a flush, ids another worker committed are pulled into this
+    process's index from the video store through `load_embeddings`, so no
+    worker answers from, or writes back, an index missing their vectors.
+    """
+
+    def __init__(self, root: str, index_type: str = "hnsw", save_interval: float = 30.0,
+                 load_embeddings: Optional[Callable[[str], Optional[np.ndarray]]] = None):
+        self.root = root
+        self.index_type = index_type
+        self.save_interval = save_interval
+        self.load_embeddings = load_embeddings
+        self.index_path = os.path.join(root, "global.faiss")
+        self._lock = threading.RLock()
+        self._dirty = False
+        # SQLite ids whose vectors couldn't be loaded, so they aren't retried on every search
+        self._unavailable = set()
+        self._saved_at = time.monotonic()
+
+        os.makedirs(root, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(root, "global_meta.sqlite3"),
+                                     check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chunks (
+                id INTEGER PRIMARY KEY,
+                video_id TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                start REAL,
+                end REAL,
+                text TEXT NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_video ON chunks(video_id)")
+        self._conn.commit()
+
+        self.index: Optional[faiss.Index] = None
+        if os.path.exists(self.index_path):
+            self.index = faiss.read_index(self.index_path)
+
+    def _new_index(self, dim: int) -> faiss.Index:
+        if self.index_type == "hnsw":
+            inner = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            inner.hnsw.efSearch = 64
+        else:
+            inner = faiss.IndexFlatIP(dim)
+        return faiss.IndexIDMap2(inner)
+
+    def contains(self, video_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM chunks WHERE video_id = ? LIMIT 1", (video_id,)).fetchone() is not None
+
+    def add(self, video_id: str, chunks: List, embeddings: np.ndarray) -> int:
+        """
+        Add one video's chunks. `chunks` are strings or dicts with
+        text/start/end. Returns the number of vectors added (0 if already indexed).
+        """
+        embeddings = np.array(embeddings, dtype=np.float32)
+        faiss.normalize_L2(embeddings)
+        with self._lock:
+            # Check and reserve the id range under a write lock so concurrent workers never collide
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                if self.contains(video_id):
+                    self._conn.rollback()
+                    return 0
+
+                first_id = self._conn.execute("SELECT COALESCE(MAX(id), -1) + 1 FROM chunks").fetchone()[0]
+                ids = np.arange(first_id, first_id + len(chunks), dtype=np.int64)
+                rows = []
+                for i, chunk in enumerate(chunks):
+                    if isinstance(chunk, dict):
+                        rows.append((int(ids[i]), video_id, i, chunk.get("start"), chunk.get("end"), chunk["text"]))
+                    else:
+                        rows.append((int(ids[i]), video_id, i, None, None, chunk))
+
+                self._conn.executemany(
+                    "INSERT INTO chunks (id, video_id, chunk_index, start, end, text) VALUES (?, ?, ?, ?, ?, ?)",
+                    rows)
+                self._conn.commit()
+            except BaseException:
+                # Never leave the write lock held on the shared connection
+                self._conn.rollback()
+                raise
+
+            if self.index is None:
+                self.index = self._new_index(embeddings.shape[1])
+            self.index.add_with_ids(embeddings, ids)
+            self._dirty = True
+            if time.monotonic() - self._saved_at > self.save_interval:
+                self.flush()
+            return len(rows)
+
+    def version(self) -> int:
+        """Chunks indexed across all workers; changes whenever any video is added."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def search(self, query_embedding: np.ndarray, top_k: int = 5) -> List[dict]:
+        with self._lock:
+            self._sync()
+            if self.index is None or self.index.ntotal == 0:
+                return []
+            scores, ids = self.index.search(
+                np.asarray(query_embedding, dtype=np.float32).reshape(1, -1), min(top_k, self.index.ntotal))
+            hits = [(int(i), float(score)) for i, score in zip(ids[0], scores[0]) if i >= 0]
+            if not hits:
+                return []
+            placeholders = ",".join("?" * len(hits))
+            rows = self._conn.execute(
+                f"SELECT id, video_id, chunk_index, start, end, text FROM chunks WHERE id IN ({placeholders})",
+                [i for i, _ in hits]).fetchall()
+
+        by_id = {row[0]: row for row in rows}
+        results = []
+        for i, score in hits:
+            if i not in by_id:
+                continue
+            _, video_id, chunk_index, start, end, text = by_id[i]
+            results.append({"video_id": video_id, "chunk_index": chunk_index, "start": start,
+                            "end": end, "text": text, "score": score})
+        return results
+
+    def _sync(self) -> int:
+        """Add vectors for SQLite ids missing from this process's index. Caller holds the lock."""
+        if self.load_embeddings is None:
+            return 0
+        count = self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        indexed = self.index.ntotal if self.index is not None else 0
+        if count == indexed + len(self._unavailable):
+            return 0
+
+        known = set(self._unavailable)
+        if self.index is not None:
+            known |= set(faiss.vector_to_array(self.index.id_map).tolist())
+        missing = {}
+        for row_id, video_id in self._conn.execute("SELECT id, video_id FROM chunks ORDER BY id"):
+            if row_id not in known:
+                missing.setdefault(video_id, []).append(row_id)
+
+        added = 0
+        for video_id, row_ids in missing.items():
+            embeddings = self.load_embeddings(video_id)
+            if embeddings is None:
+                self._unavailable.update(row_ids)
+                continue
+            row_ids = set(row_ids)
+            rows = self._conn.execute(
+                "SELECT id, chunk_index FROM chunks WHERE video_id = ? ORDER BY chunk_index",
+                (video_id,)).fetchall()
+            todo = [(row_id, chunk_index) for row_id, chunk_index in rows
+                    if row_id in row_ids and chunk_index < len(embeddings)]
+            self._unavailable.update(row_ids - {row_id for row_id, _ in todo})
+            if not todo:
+                continue
+            vectors = np.array([embeddings[chunk_index] for _, chunk_index in todo], dtype=np.float32)
+            faiss.normalize_L2(vectors)
+            if self.index is None:
+                self.index = self._new_index(vectors.shape[1])
+            self.index.add_with_ids(vectors, np.array([row_id for row_id, _ in todo], dtype=np.int64))
+            added += len(todo)
+        if added:
+            self._dirty = True
+        return added
+
+    def reconcile(self, load_embeddings: Optional[Callable[[str], Optional[np.ndarray]]] = None) -> int:
+        """
+        Re-add vectors for videos whose metadata was committed but whose index
+        flush never happened (e.g. the process was killed, or another worker
+        added them). Returns vectors re-added.
+        """
+        with self._lock:
+            if load_embeddings is not None:
+                self.load_embeddings = load_embeddings
+            self._unavailable.clear()
+            added = self._sync()
+            if added:
+                self.flush()
+            return added
+
+    def flush(self) -> None:
+        with self._lock:
+            # Never write back an index that lacks vectors other workers have committed
+            self._sync()
+            if not self._dirty or self.index is None:
+                return
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            faiss.write_index(self.index, tmp_path)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            videos, chunks = self._conn.execute(
+                "SELECT COUNT(DISTINCT video_id), COUNT(*) FROM chunks").fetchone()
+            return {
+                "videos": videos,
+                "chunks": chunks,
+                "vectors": self.index.ntotal if self.index is not None else 0,
+                "index_type": self.index_type,
+            }
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+TERMINAL_STATUSES = ("done", "failed")
+
+
+class JobError(Exception):
+    """Raised inside a job to fail it with a user-facing message."""
+
+
+class JobRegistry:
+    """
+    Registry of background video jobs, shared by every worker on the host.
+
+    At most `max_workers` jobs run at once in each process; the rest wait as
+    "queued". Each job is a plain dict (status, stage, progress, result,
+    error) that `/status` returns as-is. Job state is written to SQLite at
+    `path` on every change, so any worker can answer `/status` for a job
+    another worker runs; `watch` yields a snapshot on every change so
+    progress can be streamed. Jobs are forgotten `ttl_seconds` after their
+    last change (finished ones, or ones whose worker exited mid-run).
+    """
+
+    def __init__(self, path: str, max_workers: int = 4, ttl_seconds: float = 3600,
+                 poll_interval: float = 0.5):
+        self.path = path
+        self.max_workers = max_workers
+        self.ttl_seconds = ttl_seconds
+        # How often `watch` re-reads a job that runs in another worker
+        self.poll_interval = poll_interval
+        # Jobs running in this process, and the event fired on their next change
+        self._jobs = {}
+        self._changed = {}
+        self._active_by_key = {}
+        self._tasks = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                state TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_updated ON jobs(updated_at)")
+        self._conn.commit()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    def _save(self, job: dict) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, state, updated_at) VALUES (?, ?, ?, ?)",
+                (job["job_id"], job["status"], json.dumps(job), job["updated_at"]))
+            self._conn.commit()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.ttl_seconds
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE updated_at < ?", (cutoff,))
+            self._conn.commit()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return dict(job)
+        with self._lock:
+            row = self._conn.execute("SELECT state FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def active(self, key: str) -> Optional[dict]:
+        job_id = self._active_by_key.get(key)
+        return self.get(job_id) if job_id else None
+
+    def update(self, job_id: str, **fields) -> None:
+        job = self._jobs[job_id]
+        job.update(fields, updated_at=time.time())
+        self._save(job)
+        # Wake every watcher, then hand out a fresh event for the next change
+        self._changed[job_id].set()
+        self._changed[job_id] = asyncio.Event()
+
+    def submit(self, key: str, run: Callable[[str], Awaitable[dict]]) -> dict:
+        """
+        Start `run(job_id)` in the background, or return the job already running
+        for `key` in this process (e.g. the same video requested twice).
+        """
+        existing = self.active(key)
+        if existing is not None:
+            return existing
+
+        self._prune()
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._jobs[job_id] = {
+            "job_id": job_id, "key": key, "status": "queued", "stage": "queued", "progress": 0.0,
+            "result": None, "error": None, "created_at": now, "updated_at": now,
+        }
+        self._save(self._jobs[job_id])
+        self._changed[job_id] = asyncio.Event()
+        self._active_by_key[key] = job_id
+
+        task = asyncio.create_task(self._run(job_id, key, run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return self.get(job_id)
+
+    async def _run(self, job_id: str, key: str, run: Callable[[str], Awaitable[dict]]) -> None:
+        try:
+            async with self._get_semaphore():
+                self.update(job_id, status="running")
+                result = await run(job_id)
+            self.update(job_id, status="done", stage="done", progress=1.0, result=result)
+        except JobError as e:
+            self.update(job_id, status="failed", error=str(e))
+        except Exception as e:
+            print(f"[Job Error] {job_id}: {e}")
+            self.update(job_id, status="failed", error=f"Internal error: {e}")
+        finally:
+            if self._active_by_key.get(key) == job_id:
+                del self._active_by_key[key]
+            # Finished: served from SQLite from now on, like other workers' jobs
+            self._jobs.pop(job_id, None)
+            self._changed.pop(job_id, None)
+
+    async def _wait_for_change(self, job: dict, changed: Optional[asyncio.Event], timeout: float) -> bool:
+        """Wait until `job` changes; False after `timeout` seconds without a change."""
+        if changed is not None:
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=timeout)
+                return True
+            except asyncio.TimeoutError:
+                return False
+        # Run by another worker (or just finished here): poll the shared table
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(self.poll_interval)
+            current = await asyncio.to_thread(self.get, job["job_id"])
+            if current is None or current["updated_at"] != job["updated_at"]:
+                return True
+        return False
+
+    async def watch(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[dict]]:
+        """
+        Yield the job's state now and after every change until it finishes.
+        Yields None after `heartbeat` seconds without a change (keep-alive).
+        """
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+            # Taken before yielding so a change made meanwhile isn't missed
+            changed = self._changed.get(job_id)
+            yield job
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            while not await self._wait_for_change(job, changed, heartbeat):
+                yield None
+
+    def stats(self) -> dict:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall())
+        return {"jobs": sum(counts.values()), "by_status": counts, "running_here": len(self._jobs),
+                "max_workers": self.max_workers}
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Callable, List, Optional
+
+import faiss
+import numpy as np
+
+from common import llm_gateway
+from common.disk_cache import DiskCache, make_cache_key
+
+from .transcript import estimate_tokens
+
+# Sections are k-means clusters: related passages of one topic, not a contiguous stretch of the video
+SECTION_PROMPT = (
+    "Summarize these related excerpts of a video transcript, which may come from different points in the video, "
+    "in 3-6 concise markdown bullet points. "
+    "Keep technical terms, definitions and examples exactly as stated.\n\n{text}\n\nSection summary:"
+)
+COMBINE_PROMPT = (
+    "Merge these summaries of topics covered in one video into a single list of markdown bullet points, "
+    "removing repetition but keeping every distinct idea:\n\n{text}\n\nMerged summary:"
+)
+FINAL_PROMPT = (
+    "Below are summaries of the topics covered in one video transcript, grouped by subject rather than in the "
+    "order they were discussed. Write the overall summary of the video in bullet points using markdown, "
+    "grouped under short headings, covering every topic:\n\n"
+    "{text}\n\nSummary:"
+)
+
+
+class MapReduceSummarizer:
+    """
+    Hierarchical summary of a whole transcript.
+
+    Chunks are grouped into topical clusters with k-means over their
+    embeddings. Every chunk of every cluster is summarized (map), in
+    sections of at most `section_tokens` so each prompt stays small, and
+    the section summaries are merged `reduce_fanout` at a time until one
+    final summary is left (reduce). Every intermediate summary is cached
+    by prompt, so re-summarizing a video only pays for the sections that
+    changed.
+    """
+
+    def __init__(self, cache: DiskCache, model: Optional[str] = None, config=None,
+                 max_clusters: int = 8, section_tokens: int = 3000, reduce_fanout: int = 4):
+        self.cache = cache
+        self.model = model
+        self.config = config
+        self.max_clusters = max_clusters
+        self.section_tokens = section_tokens
+        self.reduce_fanout = max(2, reduce_fanout)
+
+    def plan_sections(self, texts: List[str], embeddings: np.ndarray) -> List[List[int]]:
+        """
+        Chunk indices for each section, sections ordered by their first
+        chunk. Together the sections cover every chunk; each one holds
+        chunks of a single cluster (not necessarily adjacent) and about
+        `section_tokens` tokens of text.
+        """
+        tokens = [estimate_tokens(text) for text in texts]
+        n = len(texts)
+        # No more clusters than there are sections' worth of text
+        n_clusters = min(self.max_clusters, n, max(1, -(-sum(tokens) // self.section_tokens)))
+        if n_clusters <= 1:
+            return self._batch(range(n), tokens)
+
+        vectors = np.array(embeddings, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        # Fixed seed: the same video always yields the same sections, so cached summaries are reused
+        kmeans = faiss.Kmeans(vectors.shape[1], n_clusters, niter=20, seed=1234, spherical=True)
+        kmeans.train(vectors)
+        _, assignment = kmeans.index.search(vectors, 1)
+
+        sections = []
+        for cluster in range(n_clusters):
+            members = np.flatnonzero(assignment[:, 0] == cluster)
+            sections.extend(self._batch(members.tolist(), tokens))
+        return sorted(sections, key=lambda section: section[0])
+
+    def _batch(self, members, tokens: List[int]) -> List[List[int]]:
+        """Split a cluster's chunks (in transcript order) into sections within the token budget."""
+        sections, current, current_tokens = [], [], 0
+        for i in members:
+            if current and current_tokens + tokens[i] > self.section_tokens:
+                sections.append(current)
+                current, current_tokens = [], 0
+            current.append(int(i))
+            current_tokens += tokens[i]
+        if current:
+            sections.append(current)
+        return sections
+
+    async def _generate(self, prompt: str) -> str:
+        cache_key = make_cache_key("youtube-summary", self.model, prompt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached.decode("utf-8")
+        response = await llm_gateway.generate_content(model=self.model, contents=prompt, config=self.config)
+        text = response.text.strip()
+        self.cache.set(cache_key, text)
+        return text
+
+    async def summarize(self, texts: List[str], embeddings: np.ndarray,
+                        on_progress: Optional[Callable[[int, int], None]] = None) -> str:
+        sections = await asyncio.to_thread(self.plan_sections, texts, embeddings)
+
+        done = 0
+
+        async def summarize_section(section):
+            nonlocal done
+            summary = await self._generate(SECTION_PROMPT.format(text="\n".join(texts[i] for i in section)))
+            done += 1
+            if on_progress:
+                on_progress(done, len(sections))
+            return summary
+
+        partials = await asyncio.gather(*(summarize_section(section) for section in sections))
+
+        while len(partials) > self.reduce_fanout:
+            groups = [partials[i:i + self.reduce_fanout] for i in range(0, len(partials), self.reduce_fanout)]
+            partials = await asyncio.gather(
+                *(self._generate(COMBINE_PROMPT.format(text="\n\n".join(group))) for group in groups))
+        return await self._generate(FINAL_PROMPT.format(text="\n\n".join(partials)))
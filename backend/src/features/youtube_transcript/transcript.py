@@ -0,0 +1,161 @@
+import hashlib
+import io
+import re
+from typing import BinaryIO, Iterable, Iterator, List
+
+# Rough words -> tokens ratio for English subword tokenizers
+TOKENS_PER_WORD = 1.3
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SENTENCE_END_RE = re.compile(r"[.!?][\"')\]]?$")
+_TIMING_RE = re.compile(r"^\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})\s*-->\s*((?:\d+:)?\d{1,2}:\d{2}[.,]\d{1,3})")
+
+CAPTION_EXTENSIONS = (".vtt", ".srt")
+
+
+def parse_timestamp(value: str) -> float:
+    """'01:02:03.450' (VTT), '01:02:03,450' (SRT) or '02:03.450' -> seconds."""
+    seconds = 0.0
+    for part in value.replace(",", ".").split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def iter_caption_cues(lines: Iterable[str]) -> Iterator[dict]:
+    """
+    Stream {start, end, text} cues out of WebVTT or SRT lines, one block at a
+    time, so large caption files are never held in memory. Headers, NOTE and
+    STYLE blocks and SRT sequence numbers are skipped.
+
+    Only a truly empty line ends a block: YouTube auto-captions open each
+    cue with a line holding a single space, which is skipped as text.
+    """
+    start = end = None
+    text_lines: List[str] = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line == "":
+            if start is not None and text_lines:
+                yield {"start": start, "end": end, "text": "\n".join(text_lines)}
+            start, end, text_lines = None, None, []
+            continue
+        timing = _TIMING_RE.match(line)
+        if timing:
+            start, end, text_lines = parse_timestamp(timing.group(1)), parse_timestamp(timing.group(2)), []
+        elif start is not None and line.strip():
+            text_lines.append(line)
+    if start is not None and text_lines:
+        yield {"start": start, "end": end, "text": "\n".join(text_lines)}
+
+
+def read_caption_stream(stream: BinaryIO) -> List[dict]:
+    """Parse a binary caption stream (file or upload) into de-duplicated cues."""
+    text_stream = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace")
+    try:
+        return dedupe_rolling_cues(iter_caption_cues(text_stream))
+    finally:
+        text_stream.detach()
+
+
+def read_caption_file(path: str) -> List[dict]:
+    with open(path, "rb") as file:
+        return read_caption_stream(file)
+
+
+def caption_file_id(stream: BinaryIO, block_size: int = 1 << 20) -> str:
+    """Content-addressed id for a caption file, so re-ingesting the same file is a no-op."""
+    digest = hashlib.sha256()
+    for block in iter(lambda: stream.read(block_size), b""):
+        digest.update(block)
+    stream.seek(0)
+    return f"local-{digest.hexdigest()[:20]}"
+
+
+def clean_caption_text(text: str) -> str:
+    """Strip inline VTT tags (<c>, word timings) and collapse whitespace."""
+    return re.sub(r"\s+", " ", _TAG_RE.sub("", text or "")).strip()
+
+
+def estimate_tokens(text: str) -> int:
+    return int(len(text.split()) * TOKENS_PER_WORD + 0.5)
+
+
+def dedupe_rolling_cues(cues: Iterable[dict], window: int = 60) -> List[dict]:
+    """
+    Remove the text YouTube auto-captions repeat from one cue to the next.
+
+    Rolling captions re-show the previous line above the new one, so each
+    cue's words usually start with the tail of what was already emitted.
+    The longest such overlap is dropped and cues left empty are skipped.
+    """
+    deduped = []
+    tail: List[str] = []
+    for cue in cues:
+        words = clean_caption_text(cue["text"]).split()
+        if not words:
+            continue
+        overlap = 0
+        for size in range(min(len(words), len(tail)), 0, -1):
+            if tail[-size:] == words[:size]:
+                overlap = size
+                break
+        new_words = words[overlap:]
+        if not new_words:
+            continue
+        deduped.append({"start": cue["start"], "end": cue["end"], "text": " ".join(new_words)})
+        tail = (tail + new_words)[-window:]
+    return deduped
+
+
+def chunk_cues(cues: List[dict], max_tokens: int = 256, overlap_tokens: int = 32) -> List[dict]:
+    """
+    Group cues into chunks of about `max_tokens`, keeping start/end timestamps.
+
+    Chunks only break on cue boundaries, preferring a cue that ends a sentence
+    once the chunk is three quarters full. The last few cues of a chunk (up to
+    `overlap_tokens`) are repeated at the start of the next one for context.
+    """
+    chunks = []
+    current: List[dict] = []
+    current_tokens = 0
+
+    def flush():
+        chunks.append({
+            "text": " ".join(cue["text"] for cue in current),
+            "start": current[0]["start"],
+            "end": current[-1]["end"],
+        })
+
+    for cue in cues:
+        tokens = estimate_tokens(cue["text"])
+        if current and current_tokens + tokens > max_tokens:
+            flush()
+            carried, carried_tokens = [], 0
+            for previous in reversed(current):
+                previous_tokens = estimate_tokens(previous["text"])
+                if carried_tokens + previous_tokens > overlap_tokens:
+                    break
+                carried.insert(0, previous)
+                carried_tokens += previous_tokens
+            current, current_tokens = carried, carried_tokens
+
+        current.append(cue)
+        current_tokens += tokens
+
+        if current_tokens >= 0.75 * max_tokens and _SENTENCE_END_RE.search(cue["text"]):
+            flush()
+            current, current_tokens = [], 0
+
+    if current:
+        flush()
+    return chunks
+
+
+def cues_to_text(cues: Iterable[dict]) -> str:
+    return " ".join(cue["text"] for cue in cues)
+
+
+def normalize_chunks(chunks: list) -> List[dict]:
+    """Chunks stored before timestamps were kept are plain strings."""
+    return [chunk if isinstance(chunk, dict) else {"text": chunk, "start": None, "end": None}
+            for chunk in chunks]
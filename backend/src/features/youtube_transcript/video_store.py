@@ -0,0 +1,212 @@
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+# YouTube video ids, or the "local-<hash>" ids of ingested caption files
+VIDEO_ID_PATTERN = re.compile(r"[0-9A-Za-z_-]{11}|local-[0-9a-f]{20}")
+
+
+def is_valid_video_id(video_id) -> bool:
+    return isinstance(video_id, str) and VIDEO_ID_PATTERN.fullmatch(video_id) is not None
+
+
+def _atomic_write(path: str, write) -> None:
+    # Write to a temp file in the same directory, then rename over the target,
+    # so other workers never see a half-written file
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+class VideoStore:
+    """
+    On-disk store of processed videos, one directory per video id:
+
+        transcript.txt, chunks.json, embeddings.npy (float32), summary.md, meta.json
+
+    meta.json is written last and marks the entry as complete. Embeddings are
+    memory-mapped on load so every worker shares the same page cache.
+    """
+
+    def __init__(self, root: str):
+        self.root = os.path.realpath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, video_id: str) -> str:
+        # Ids come from request bodies; never let one name a path outside the store
+        if not is_valid_video_id(video_id):
+            raise ValueError(f"Invalid video id: {video_id!r}")
+        video_dir = os.path.realpath(os.path.join(self.root, video_id))
+        if os.path.dirname(video_dir) != self.root:
+            raise ValueError(f"Invalid video id: {video_id!r}")
+        return video_dir
+
+    def exists(self, video_id: str) -> bool:
+        if not is_valid_video_id(video_id):
+            return False
+        return os.path.exists(os.path.join(self._dir(video_id), "meta.json"))
+
+    def save(self, video_id: str, transcript: str, chunks: list, embeddings: np.ndarray,
+             summary: str, meta: Optional[dict] = None) -> None:
+        video_dir = self._dir(video_id)
+        os.makedirs(video_dir, exist_ok=True)
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+        def write_text(content):
+            def write(path):
+                with open(path, "w", encoding="utf-8") as file:
+                    file.write(content)
+            return write
+
+        def write_embeddings(path):
+            with open(path, "wb") as file:
+                np.save(file, embeddings)
+
+        _atomic_write(os.path.join(video_dir, "transcript.txt"), write_text(transcript))
+        _atomic_write(os.path.join(video_dir, "chunks.json"), write_text(json.dumps(chunks)))
+        _atomic_write(os.path.join(video_dir, "embeddings.npy"), write_embeddings)
+        _atomic_write(os.path.join(video_dir, "summary.md"), write_text(summary))
+        meta = dict(meta or {}, video_id=video_id, num_chunks=len(chunks),
+                    dim=int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+                    created_at=time.time())
+        _atomic_write(os.path.join(video_dir, "meta.json"), write_text(json.dumps(meta)))
+
+    def load(self, video_id: str) -> Optional[dict]:
+        """Return chunks, memory-mapped embeddings, summary and meta, or None if not stored."""
+        if not self.exists(video_id):
+            return None
+        video_dir = self._dir(video_id)
+        try:
+            with open(os.path.join(video_dir, "meta.json"), "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            with open(os.path.join(video_dir, "chunks.json"), "r", encoding="utf-8") as file:
+                chunks = json.load(file)
+            with open(os.path.join(video_dir, "summary.md"), "r", encoding="utf-8") as file:
+                summary = file.read()
+            embeddings = np.load(os.path.join(video_dir, "embeddings.npy"), mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"[VideoStore] Failed to load {video_id}: {e}")
+            return None
+        return {"chunks": chunks, "embeddings": embeddings, "summary": summary, "meta": meta}
+
+    def load_transcript(self, video_id: str) -> Optional[str]:
+        if not is_valid_video_id(video_id):
+            return None
+        path = os.path.join(self._dir(video_id), "transcript.txt")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            return file.read()
+
+
+def estimate_nbytes(value) -> int:
+    """Approximate resident bytes of a cached value (arrays, tensors, FAISS indexes, text)."""
+    if isinstance(value, np.memmap):
+        # File-backed pages live in the shared page cache, not in this process
+        return 0
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "element_size") and hasattr(value, "nelement"):
+        return value.element_size() * value.nelement()
+    if hasattr(value, "ntotal") and hasattr(value, "d"):
+        # FAISS index: stored codes, or graph links plus the wrapped storage for HNSW
+        hnsw = getattr(value, "hnsw", None)
+        if hnsw is not None:
+            return value.ntotal * hnsw.nb_neighbors(0) * 4 + estimate_nbytes(value.storage)
+        return value.ntotal * getattr(value, "code_size", value.d * 4)
+    if isinstance(value, str):
+        return sys.getsizeof(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class VideoMemory:
+    """
+    In-RAM tier in front of VideoStore, bounded by entry count and an
+    approximate byte budget, with TTL expiry and LRU eviction.
+    """
+
+    def __init__(self, max_entries: int = 32, max_bytes: int = 512 * 1024 * 1024,
+                 ttl_seconds: float = 0):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = {"lru": 0, "ttl": 0}
+        self._entries = OrderedDict()  # video_id -> (entry, nbytes, stored_at)
+        self._lock = threading.Lock()
+
+    def __contains__(self, video_id: str) -> bool:
+        with self._lock:
+            return video_id in self._entries
+
+    def _remove(self, video_id: str, reason: str) -> None:
+        _, nbytes, _ = self._entries.pop(video_id)
+        self.resident_bytes -= nbytes
+        self.evictions[reason] += 1
+
+    def get(self, video_id: str) -> Optional[dict]:
+        with self._lock:
+            item = self._entries.get(video_id)
+            if item is None:
+                self.misses += 1
+                return None
+            entry, _, stored_at = item
+            if self.ttl_seconds and time.time() - stored_at > self.ttl_seconds:
+                self._remove(video_id, "ttl")
+                self.misses += 1
+                return None
+            self._entries.move_to_end(video_id)
+            self.hits += 1
+            return entry
+
+    def put(self, video_id: str, entry: dict) -> None:
+        nbytes = estimate_nbytes(entry)
+        with self._lock:
+            if video_id in self._entries:
+                _, old_nbytes, _ = self._entries.pop(video_id)
+                self.resident_bytes -= old_nbytes
+            self._entries[video_id] = (entry, nbytes, time.time())
+            self.resident_bytes += nbytes
+
+            if self.ttl_seconds:
+                cutoff = time.time() - self.ttl_seconds
+                for expired in [key for key, (_, _, stored_at) in self._entries.items() if stored_at < cutoff]:
+                    self._remove(expired, "ttl")
+
+            # Always keep the newest entry, even if it alone exceeds the budget
+            while len(self._entries) > 1 and (
+                    len(self._entries) > self.max_entries or self.resident_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)), "lru")
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            per_entry = {key: nbytes for key, (_, nbytes, _) in self._entries.items()}
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(per_entry),
+            "resident_bytes": self.resident_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": dict(self.evictions),
+            "per_entry_bytes": per_entry,
+        }
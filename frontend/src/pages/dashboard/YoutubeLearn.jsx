@@ -45,12 +45,25 @@ function YoutubeLearn() {
         url: videoUrl
       });
 
-      setSessionId(response.data.session_id);
-      setSummary(response.data.summary);
+      // New videos are processed as a background job; poll until the summary is ready
+      let result = response.data;
+      while (result.job_id && !result.summary) {
+        await new Promise(resolve => setTimeout(resolve, 1500));
+        const status = await axios.get(`http://127.0.0.1:8000/api/youtube/status/${result.job_id}`);
+        if (status.data.status === 'failed') {
+          throw new Error(status.data.error);
+        }
+        if (status.data.status === 'done') {
+          result = status.data.result;
+        }
+      }
+
+      setSessionId(result.session_id);
+      setSummary(result.summary);
       setMessages([
         {
           type: 'system',
-          content: response.data.summary
+          content: result.summary
         }
       ]);
       toast.success('Video analyzed successfully!');